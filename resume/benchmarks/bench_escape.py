@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Micro-benchmark + equivalence check for the LaTeX escaping engine (plain and
+# edu against the old replace chain, url against fixed expectations).
+#   python3 benchmarks/bench_escape.py [--n 20000]
+import argparse, random, re, sys, timeit
+from types import SimpleNamespace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import build_and_compile as bc
+
+SPECIALS = "\\&%$#_{}~^"
+WORDS = ["Rwik Rana", "Joydeep Biswas", "Byron Boots", "robot", "learning", "MPC",
+         "C++", "R&D", "100%", "$x_i$", "#1", "a_b", "{set}", "~home", "x^2", "path\\to"]
+
+def legacy_escape(s, pairs):
+    """The original chained str.replace implementation."""
+    s = (s or "").strip()
+    for a, b in pairs:
+        s = s.replace(a, b)
+    return s
+
+def single_pass(pairs):
+    """Single-pass alternatives (str.translate and one compiled regex), kept
+    here to show why the engine stays with the replace chain."""
+    table = {}
+    for needle, _ in pairs:
+        out = needle
+        for a, b in pairs:  # what the chain turns this character into
+            out = out.replace(a, b)
+        table[needle] = out
+    trans = str.maketrans(table)
+    rx = re.compile("[" + re.escape("".join(table)) + "]")
+    sub = lambda m: table[m.group()]
+    return (lambda s: (s or "").strip().translate(trans),
+            lambda s: rx.sub(sub, (s or "").strip()))
+
+def corpus(n, seed=0):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        k = rnd.randint(1, 40)
+        out.append(" " + ", ".join(rnd.choice(WORDS) for _ in range(k)) + rnd.choice(["", " ", SPECIALS]))
+    out += ["", None, SPECIALS, SPECIALS * 50, "plain text only"]
+    return out
+
+def check_equivalence(strings):
+    for profile, pairs in (("plain", bc.LATEX_ESC_PLAIN), ("edu", bc.LATEX_ESC_EDU)):
+        for s in strings:
+            want, got = legacy_escape(s, pairs), bc.latex_escape(s, profile)
+            if want != got:
+                raise SystemExit(f"MISMATCH ({profile}) for {s!r}:\n  legacy {want!r}\n  engine {got!r}")
+    print(f"equivalence: {len(strings)} strings x 2 profiles OK")
+
+# The url profile (\href targets) replaced two different old behaviours, so
+# it is checked against fixed expectations instead of an old implementation:
+# href -> (old experience link: esc_edu, old publication link: raw, url profile).
+# Expected differences: experience links no longer escape _ & $ ~ ^, which
+# hyperref takes verbatim; publication links now escape % and #, which
+# otherwise break the \href argument inside \item.
+URL_FIXTURES = {
+    "https://github.com/rwik/my_repo":
+        (r"https://github.com/rwik/my\_repo", "https://github.com/rwik/my_repo", "https://github.com/rwik/my_repo"),
+    "https://x.org/search?q=a&lang=en":
+        (r"https://x.org/search?q=a\&lang=en", "https://x.org/search?q=a&lang=en", "https://x.org/search?q=a&lang=en"),
+    "https://x.org/100%25_done#results":
+        (r"https://x.org/100\%25\_done\#results", "https://x.org/100%25_done#results",
+         r"https://x.org/100\%25_done\#results"),
+    " https://x.org/a_b%20c?x=1&y=2#s ":
+        (r"https://x.org/a\_b\%20c?x=1\&y=2\#s", "https://x.org/a_b%20c?x=1&y=2#s",
+         r"https://x.org/a_b\%20c?x=1&y=2\#s"),
+    "https://plain.example.com/page": ("https://plain.example.com/page",) * 3,
+}
+
+def check_url_profile():
+    links = ("paper_link", "code_link", "website_link", "video_link", "image_link")
+    changed = 0
+    for href, (old_exp, old_pub, new) in URL_FIXTURES.items():
+        checks = [("old experience", legacy_escape(href, bc.LATEX_ESC_EDU), old_exp),
+                  ("old publication", href.strip(), old_pub),
+                  ("url profile", bc.latex_escape(href, "url"), new)]
+        exp = bc._format_exp_links(SimpleNamespace(**dict.fromkeys(links, href)))
+        pub = bc.make_pub_item(SimpleNamespace(title="T", authors="A", venue="V", link=href.strip()))
+        checks += [("experience item", exp, " ".join(rf"\href{{{new}}}{{[{k}]}}"
+                                                     for k in ("Paper", "Code", "Website", "Video", "Image"))),
+                   ("publication item", f"\\href{{{new}}}" in pub, True)]
+        for what, got, want in checks:
+            if got != want:
+                raise SystemExit(f"MISMATCH ({what}) for {href!r}:\n  expected {want!r}\n  got      {got!r}")
+        changed += (old_exp != new) + (old_pub != new)
+    print(f"url profile: {len(URL_FIXTURES)} hrefs OK; {changed} old link outputs differ, as expected")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=20000, help="number of distinct strings")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    strings = corpus(args.n)
+    check_equivalence(strings)
+    check_url_profile()
+
+    # repeated strings, as author lists and skill names are in practice
+    workload = strings + strings[: args.n // 2] * 3
+    rnd = random.Random(1)
+    dense = ["".join(rnd.choice("abcdefghij &%_#") for _ in range(5000)) for _ in range(200)]
+    best = lambda fn, data: min(timeit.repeat(lambda: [fn(s) for s in data],
+                                              number=1, repeat=args.repeat))
+    def cold(data, profile):
+        bc._escape.cache_clear()
+        return [bc.latex_escape(s, profile) for s in data]
+    print(f"{'profile':14s} {'legacy':>9s} {'translate':>10s} {'regex':>9s} {'cold':>9s} {'warm':>9s}  (ms)")
+    for profile, pairs in (("plain", bc.LATEX_ESC_PLAIN), ("edu", bc.LATEX_ESC_EDU)):
+        translate, regex = single_pass(pairs)
+        for label, data in (("fields", workload), ("dense", dense)):
+            row = [best(lambda s: legacy_escape(s, pairs), data), best(translate, data), best(regex, data),
+                   min(timeit.repeat(lambda: cold(data, profile), number=1, repeat=args.repeat)),
+                   best(lambda s: bc.latex_escape(s, profile), data)]
+            print(f"{profile + '/' + label:14s} " + " ".join(f"{t*1e3:9.1f}" for t in row)
+                  + f"  [{len(data)} calls]")
+
+if __name__ == "__main__":
+    main()
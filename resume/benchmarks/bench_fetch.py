@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Tail latency of fetching every tab, with and without fetch_policy, against
+# the fake server with injected latency spikes and 503s.
+#   python3 benchmarks/bench_fetch.py [--builds 100] [--warmup 5] [--spike-rate 0.03] [--spike-latency 2] [--fail-rate 0.05]
+# Each build is a fresh process running fetch_all() of the seven tabs,
+# bypassing the sheet cache, timed from start to exit: a slow attempt that
+# lost a hedge race and still held the process open would count. The two
+# modes alternate build by build. Without the policy a 503 fails the build;
+# those builds are counted, and their time is kept. A few untimed builds
+# first give the policy the latency samples it would have kept from earlier
+# runs (each policy build saves them, as a real one does).
+import argparse, json, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parent.parent), str(Path(__file__).resolve().parent)]
+import build_and_compile as bc
+import fetch_policy
+import synth
+from fakeserver import FakeServer
+from run_benchmarks import DATA_DIR, _point_at
+
+def child(args):
+    """One build, in this process; prints whether it succeeded and the policy's stats."""
+    fetch_policy.LATENCY_FILE = Path(args.latency_file)
+    bc.FETCH_POLICY = args.child == "policy"
+    fetch_policy.start(args.deadline)
+    urls = _point_at(bc, args.base_url, args.rows)
+    try:
+        bc.fetch_all(urls, use_cache=False)
+        ok = True
+    except bc.requests.RequestException:
+        ok = False
+    if bc.FETCH_POLICY:
+        fetch_policy.save()
+    print(json.dumps({"ok": ok, "stats": fetch_policy.run_stats()}))
+    return 0
+
+def one_build(args, base_url, policy):
+    """Wall time of a whole build process, whether it succeeded, and its stats."""
+    cmd = [sys.executable, __file__, "--child", "policy" if policy else "plain", "--base-url", base_url,
+           "--rows", str(args.rows), "--deadline", str(args.deadline), "--latency-file", args.latency_file]
+    t = time.perf_counter()
+    out = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, check=True).stdout
+    seconds = time.perf_counter() - t
+    result = json.loads(out.splitlines()[-1])
+    return seconds, result["ok"], result["stats"]
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--builds", type=int, default=100)
+    ap.add_argument("--warmup", type=int, default=5, help="untimed builds that give the policy its latency samples")
+    ap.add_argument("--rows", type=int, default=100)
+    ap.add_argument("--latency", type=float, default=0.02)
+    ap.add_argument("--jitter", type=float, default=0.02)
+    ap.add_argument("--spike-rate", type=float, default=0.03)
+    ap.add_argument("--spike-latency", type=float, default=2.0)
+    ap.add_argument("--fail-rate", type=float, default=0.05)
+    ap.add_argument("--deadline", type=float, default=bc.BUILD_DEADLINE)
+    ap.add_argument("--child", choices=("plain", "policy"), help=argparse.SUPPRESS)
+    ap.add_argument("--base-url", help=argparse.SUPPRESS)
+    ap.add_argument("--latency-file", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        return child(args)
+    synth.ensure_sheets(DATA_DIR / str(args.rows), args.rows)
+
+    with FakeServer(latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate,
+                    spike_rate=args.spike_rate, spike_latency=args.spike_latency,
+                    data_dir=DATA_DIR) as server, tempfile.TemporaryDirectory() as tmp:
+        args.latency_file = str(Path(tmp) / "latency.json")
+        fetch_policy.LATENCY_FILE = Path(args.latency_file)
+        tabs = len(_point_at(bc, server.base_url, args.rows))
+        print(f"{args.builds} builds of {tabs} tabs each, timed as whole processes; "
+              f"{args.spike_rate:.0%} of requests +{args.spike_latency:g}s, {args.fail_rate:.0%} answered 503")
+        for _ in range(args.warmup):  # in real use the samples carry over from earlier builds
+            one_build(args, server.base_url, True)
+        times = {False: [], True: []}
+        failed = {False: 0, True: 0}
+        extra = {"hedges": 0, "retries": 0}
+        for _ in range(args.builds):
+            for policy in (False, True):
+                seconds, ok, stats = one_build(args, server.base_url, policy)
+                times[policy].append(seconds)
+                failed[policy] += not ok
+                if policy:
+                    for key in extra:
+                        extra[key] += sum(r[key] for r in stats.values())
+
+        print(f"{'':16s} {'p50':>7s} {'p95':>7s} {'p99':>7s} {'max':>7s} {'failed':>7s}")
+        for policy, name in ((False, "plain get"), (True, "fetch_policy")):
+            t = times[policy]
+            print(f"{name:16s} " + " ".join(f"{fetch_policy.percentile(t, p):6.2f}s" for p in (50, 95, 99))
+                  + f" {max(t):6.2f}s {failed[policy]:7d}")
+        p99 = {k: fetch_policy.percentile(v, 99) for k, v in times.items()}
+        print(f"p99 build time x{p99[False] / p99[True]:.1f} lower with the policy; "
+              f"median {statistics.median(times[True]) - statistics.median(times[False]):+.2f}s; "
+              f"cost: {extra['hedges']} hedged + {extra['retries']} retried requests "
+              f"({(extra['hedges'] + extra['retries']) / (args.builds * tabs):.0%} more).")
+        print("Fetch time per tab with the policy, warm-up included (fetches per bucket):")
+        for line in fetch_policy.histogram_lines():
+            print("  " + line)
+    return 0 if p99[True] < p99[False] and not failed[True] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Compile time with and without the precompiled preamble format.
+#   python3 benchmarks/bench_format.py [--runs 5]
+# Copies main.tex and sections/ to a scratch directory, dumps the format there
+# (timed once), then runs full latexmk compiles (no .aux left over) alternating
+# with and without it. Needs latexmk, pdflatex and mylatexformat.
+import argparse, os, shutil, statistics, sys, tempfile, time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(HERE))
+import build_resume as br
+
+def compile_once(work, use_format):
+    shutil.rmtree(work / "output", ignore_errors=True)
+    t = time.perf_counter()
+    fmt = br.compile_pdf(work, quiet=True, use_format=use_format)
+    return time.perf_counter() - t, fmt
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+    if not shutil.which("latexmk") or not shutil.which(br.FORMAT_ENGINE):
+        print(f"latexmk / {br.FORMAT_ENGINE} not found; nothing to measure.")
+        return 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        shutil.copy(HERE / br.MAIN_TEX, work / br.MAIN_TEX)
+        shutil.copytree(HERE / br.SECTIONS_DIR, work / br.SECTIONS_DIR)
+        br.FORMAT_DIR = work / ".fmt"
+        os.chdir(work)
+
+        t = time.perf_counter()
+        fmt = br.ensure_format(work)
+        dump = time.perf_counter() - t
+        if not fmt:
+            print("Could not dump the preamble format; see the warning above.")
+            return 1
+        print(f"format {fmt}: dumped in {dump:.2f}s "
+              f"({(br.FORMAT_DIR / f'{fmt}.fmt').stat().st_size / 1e6:.1f} MB)")
+
+        times = {False: [], True: []}
+        for _ in range(args.runs):
+            for use_format in (False, True):
+                times[use_format].append(compile_once(work, use_format)[0])
+        plain, fast = statistics.median(times[False]), statistics.median(times[True])
+        print(f"latexmk without format: median {plain:.2f}s (min {min(times[False]):.2f}s) over {args.runs} runs")
+        print(f"latexmk with format:    median {fast:.2f}s (min {min(times[True]):.2f}s) over {args.runs} runs")
+        print(f"speedup x{plain / fast:.2f}, saves {plain - fast:.2f}s per build; "
+              f"the dump pays for itself after {max(1, round(dump / (plain - fast)))} builds"
+              if fast < plain else "no speedup")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
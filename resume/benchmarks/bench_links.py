@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Link checker benchmark against the local fake server: a mix of ok, slow,
+# redirecting, dead, blocked and HEAD-refusing links on two "hosts"
+# (127.0.0.1 and localhost), checked one at a time and then concurrently,
+# and again with a warm cache.
+#   python3 benchmarks/bench_links.py [--links 60] [--slow-ms 200]
+# Checks each link's classification and that no host saw more than
+# LINK_PER_HOST requests at once.
+import argparse, sys, tempfile, time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parent.parent), str(Path(__file__).resolve().parent)]
+import check_links as cl
+from fakeserver import FakeServer
+
+# kind -> expected state
+KINDS = {"ok": "ok", "slow": "ok", "redirect": "ok", "nohead": "ok",
+         "dead": "dead", "gone": "dead", "error": "dead", "blocked": "unknown"}
+
+def make_links(server, n, slow_ms):
+    links, expected = {}, {}
+    kinds = list(KINDS)
+    for i in range(n):
+        kind = kinds[i % len(kinds)]
+        path = {"slow": f"slow/{slow_ms}", "redirect": f"redirect/{1 + i % 3}"}.get(kind, kind)
+        url = server.link_url(path, i, host=("127.0.0.1", "localhost")[i // len(kinds) % 2])
+        links[url] = [f"bench row {i}"]
+        expected[url] = KINDS[kind]
+    return links, expected
+
+def timed(links, **kwargs):
+    t = time.perf_counter()
+    results, checked = cl.check_links(list(links), **kwargs)
+    return time.perf_counter() - t, results, checked
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--links", type=int, default=60)
+    ap.add_argument("--slow-ms", type=int, default=200)
+    args = ap.parse_args(argv)
+    ok = True
+    with FakeServer() as server, tempfile.TemporaryDirectory() as tmp:
+        cl.LINK_CACHE = Path(tmp) / "links.json"
+        links, expected = make_links(server, args.links, args.slow_ms)
+        g = server.google
+        print(f"{len(links)} links on 2 hosts, {sum('/slow/' in u for u in links)} taking {args.slow_ms}ms")
+
+        serial, _, _ = timed(links, use_cache=False, workers=1, per_host=1)
+        g.link_peak.clear()
+        before = dict(g.link_requests)
+        cold, results, checked = timed(links)
+        peak = max(g.link_peak.values())
+        requests = {m: g.link_requests[m] - before[m] for m in before}
+        warm, _, rechecked = timed(links)
+
+        wrong = [u for u in links if results[u]["state"] != expected[u]]
+        for url in wrong:
+            print(f"MISMATCH {url}: {results[url]['state']} (HTTP {results[url]['status']}), "
+                  f"expected {expected[url]}")
+        ok &= not wrong and peak <= cl.LINK_PER_HOST and rechecked == 0
+        print(f"serial:            {serial:6.2f}s")
+        print(f"concurrent, cold:  {cold:6.2f}s  x{serial / cold:.1f}  "
+              f"({checked} checked: {requests['HEAD']} HEAD + {requests['GET']} GET, "
+              f"peak {peak} per host, limit {cl.LINK_PER_HOST})")
+        print(f"concurrent, warm:  {warm:6.3f}s  ({rechecked} re-checked)")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Row representation benchmark: csv.DictReader dicts + per-row alias probing
+# (the original normalizers) vs. Tables of tuples + header-compiled records.
+#   python3 benchmarks/bench_rows.py [--rows 100000]
+# Reports parse and normalize time, both together from the downloaded bytes
+# (what a build spends), and the memory held by the parsed tab plus its
+# normalized rows; checks that both paths produce the same values and that
+# records are faster end to end on every tab.
+import argparse, csv, gc, io, re, sys, time, tracemalloc
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parent.parent), str(Path(__file__).resolve().parent)]
+import build_and_compile as bc
+import synth
+
+# --- the original dict-based normalizers ---
+def legacy_pub(row):
+    return {
+        "title":   (row.get("title")   or row.get("Title")   or "").strip(),
+        "authors": (row.get("authors") or row.get("Authors") or "").strip(),
+        "venue":   (row.get("venue")   or row.get("Venue")   or "").strip(),
+        "link":    (row.get("link")    or row.get("URL")     or row.get("Link") or "").strip(),
+        "tag":     (row.get("tag")     or row.get("Tag")     or "").strip(),
+    }
+
+def legacy_research(row):
+    text = (row.get("Research Interest") or row.get("Research Interests") or
+            row.get("research interest") or row.get("research interests") or "")
+    text = re.sub(r"\s*\n\s*", " ", text).strip()
+    tag  = (row.get("tag") or row.get("Tag") or "").strip()
+    return {"text": text, "tag": tag}
+
+def legacy_experience(row):
+    def g(*names):
+        for n in names:
+            if n in row and row[n] is not None:
+                return str(row[n]).strip()
+        return ""
+    return {
+        "company": g("Company"), "team": g("Team"), "experience": g("Experience", "Role", "Project"),
+        "advisors": g("Advisors", "Advisor"), "description": g("Description", "Bullets"),
+        "position": g("Position", "Title"), "company_date": g("Company Date", "Date"), "tag": g("tag", "Tag"),
+        "paper_link": g("Paper Link", "Paper", "Paper URL"),
+        "code_link": g("Code Link", "Code", "Code URL", "Github", "GitHub"),
+        "website_link": g("Project Website", "Website", "Project URL"),
+        "video_link": g("Video Link", "Video", "Demo Video"), "image_link": g("Image Link", "Image", "Demo Image"),
+    }
+
+CASES = [
+    ("publications", legacy_pub,        bc.PUB_SCHEMA),
+    ("research",     legacy_research,   bc.RESEARCH_SCHEMA),
+    ("experience",   legacy_experience, bc.EXPERIENCE_SCHEMA),
+]
+
+def dict_path(body, legacy):
+    rows = list(csv.DictReader(io.StringIO(body.decode("utf-8-sig"))))
+    return rows, list(map(legacy, rows))
+
+def record_path(body, schema):
+    table = bc._parse_csv(body)
+    return table, list(bc.iter_records(schema, table))
+
+def held_mb(build):
+    """Memory still allocated after build() returns, while its result (the
+    parsed tab plus its normalized rows) is alive."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 1e6
+
+def timed(fn, repeat=5):
+    """Best time of fn(), each run starting from a collected heap without
+    the previous run's result, and that result."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        out = None
+        gc.collect()
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000)
+    args = ap.parse_args(argv)
+    paths = synth.ensure_sheets(Path(bc.__file__).resolve().parent / ".cache" / "bench" / str(args.rows), args.rows)
+
+    print(f"{args.rows:,} rows per tab; best of 5")
+    print(f"{'tab':13s} {'':8s} {'parse':>8s} {'normalize':>10s} {'both':>8s} {'held':>9s}")
+    ok = True
+    for tab, legacy, schema in CASES:
+        body = paths[tab].read_bytes()
+        # end to end first, while nothing else is alive for the collector to walk
+        t_both_d = timed(lambda: dict_path(body, legacy))[0]
+        t_both_t = timed(lambda: record_path(body, schema))[0]
+        mem_d = held_mb(lambda: dict_path(body, legacy))
+        mem_t = held_mb(lambda: record_path(body, schema))
+
+        t_parse_d, dicts = timed(lambda: list(csv.DictReader(io.StringIO(body.decode("utf-8-sig")))))
+        t_norm_d, old = timed(lambda: list(map(legacy, dicts)))
+        t_parse_t, table = timed(lambda: bc._parse_csv(body))
+        t_norm_t, new = timed(lambda: list(bc.iter_records(schema, table)))
+
+        same = [r._asdict() for r in new] == old
+        ok &= same and t_both_t < t_both_d
+        print(f"{tab:13s} {'dicts':8s} {t_parse_d:7.3f}s {t_norm_d:9.3f}s {t_both_d:7.3f}s {mem_d:7.1f}MB")
+        print(f"{'':13s} {'records':8s} {t_parse_t:7.3f}s {t_norm_t:9.3f}s {t_both_t:7.3f}s {mem_t:7.1f}MB"
+              f"   x{t_both_d / t_both_t:.2f} end to end, memory -{100 * (1 - mem_t / mem_d):.0f}%"
+              + ("" if same else "   MISMATCH"))
+        del dicts, old, table, new
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
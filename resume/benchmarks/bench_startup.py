@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Import-time / startup benchmark for the resume scripts.
+#   python3 benchmarks/bench_startup.py [--runs 10] [--budget-ms 150]
+# Each module is imported in a fresh interpreter; the median wall time over
+# --runs is compared against its budget and the script exits 1 on a regression.
+# With the Google client installed, it also times credential-free client setup
+# (discovery document load + service construction), cold and warm.
+import argparse, json, os, statistics, subprocess, sys, tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent.parent
+
+# module -> default budget (ms) for `import module` in a fresh interpreter
+BUDGETS = {
+    "cv_sync_google": 150,
+    "build_resume": 400,
+}
+
+SETUP_SNIPPET = """
+import json, sys, time
+from google.auth.credentials import AnonymousCredentials
+import cv_sync_google as s
+creds = AnonymousCredentials()
+t = time.perf_counter()
+s.build_service("drive", "v3", creds)
+s.build_service("sheets", "v4", creds)
+print(json.dumps({"setup_ms": (time.perf_counter() - t) * 1e3}))
+"""
+
+def _run(code, cwd, env=None):
+    return subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+
+def import_ms(module, runs):
+    code = (f"import time; t = time.perf_counter(); import {module}; "
+            f"print((time.perf_counter() - t) * 1e3)")
+    env = dict(os.environ, PYTHONPATH=str(HERE) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    times = []
+    for _ in range(runs):
+        p = _run(code, HERE, env)
+        if p.returncode != 0:
+            return None, p.stderr.strip().splitlines()[-1]
+        times.append(float(p.stdout.strip()))
+    return statistics.median(times), None
+
+def client_setup_ms():
+    """(cold, warm) service construction time, or None without googleapiclient."""
+    env = dict(os.environ, PYTHONPATH=str(HERE) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    with tempfile.TemporaryDirectory() as cwd:  # empty .cache/discovery
+        out = []
+        for _ in range(2):
+            p = _run(SETUP_SNIPPET, cwd, env)
+            if p.returncode != 0:
+                return None
+            out.append(json.loads(p.stdout.strip().splitlines()[-1])["setup_ms"])
+    return tuple(out)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--budget-ms", type=float, default=None,
+                    help="override every per-module budget")
+    args = ap.parse_args(argv)
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        budget = args.budget_ms or budget
+        ms, error = import_ms(module, args.runs)
+        if ms is None:
+            print(f"{module:16s} import failed: {error}")
+            failed = True
+            continue
+        verdict = "ok" if ms <= budget else "OVER BUDGET"
+        failed |= ms > budget
+        print(f"{module:16s} import {ms:7.1f} ms  (budget {budget:.0f} ms)  {verdict}")
+
+    setup = client_setup_ms()
+    if setup:
+        print(f"client setup     cold {setup[0]:7.1f} ms  warm {setup[1]:7.1f} ms (cached discovery)")
+    else:
+        print("client setup     skipped (google-api-python-client not installed)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# Tag selection benchmark: the original per-row re.split scan against
+# TagIndex lookups, for a few tag combinations over every tagged tab.
+#   python3 benchmarks/bench_tags.py [--rows 100000]
+# Checks that both select the same rows.
+import argparse, re, sys, time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).resolve().parent.parent), str(Path(__file__).resolve().parent)]
+import build_and_compile as bc
+import synth
+from run_benchmarks import TAB_URLS, _point_at
+
+QUERIES = [
+    ("resume",                  bc.tag_query(any_of=["resume"])),
+    ("website|talk",            bc.tag_query(any_of=["website", "talk"])),
+    ("resume & website",        bc.tag_query(all_of=["resume", "website"])),
+    ("resume, not paper",       bc.tag_query(any_of=["resume"], exclude=["paper"])),
+]
+
+def scan_tags(cell):  # the original tag_has_resume split, generalized
+    return {p.strip().lower() for p in re.split(r"[;,]", cell or "")} - {""}
+
+def scan(tabs, query):
+    out = {}
+    for url, (schema, label) in bc.tagged_tabs().items():
+        out[url] = []
+        for i, r in enumerate(bc.iter_records(schema.project("tag"), tabs[url], label)):
+            tags = scan_tags(r.tag)
+            if ((not query.any_of or tags & query.any_of) and query.all_of <= tags
+                    and not tags & query.exclude):
+                out[url].append(i)
+    return out
+
+def lookup(index, query):
+    return {url: index.positions(url, query) for url in bc.tagged_tabs()}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100000)
+    args = ap.parse_args(argv)
+    paths = synth.ensure_sheets(Path(bc.__file__).resolve().parent / ".cache" / "bench" / str(args.rows), args.rows)
+    _point_at(bc, "http://bench.invalid", args.rows)
+    tabs = {getattr(bc, TAB_URLS[tab]): bc._parse_csv(p.read_bytes()) for tab, p in paths.items()}
+
+    bc.parse_tags.cache_clear()
+    t = time.perf_counter()
+    index = bc.TagIndex(tabs)
+    for url in bc.tagged_tabs():
+        index.postings(url)
+    t_build = time.perf_counter() - t
+    print(f"{args.rows:,} rows per tagged tab; index built in {t_build:.3f}s, "
+          f"{len(index.tags())} distinct tags")
+    print(f"{'query':20s} {'regex scan':>11s} {'index':>9s}")
+    ok = True
+    for name, query in QUERIES:
+        t = time.perf_counter()
+        old = scan(tabs, query)
+        t_scan = time.perf_counter() - t
+        t = time.perf_counter()
+        new = lookup(index, query)
+        t_index = time.perf_counter() - t
+        same = old == new
+        ok &= same
+        print(f"{name:20s} {t_scan:10.3f}s {t_index:8.4f}s   x{t_scan / max(t_index, 1e-9):,.0f}"
+              + ("" if same else "   MISMATCH"))
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
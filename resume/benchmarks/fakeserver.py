@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# Local stand-in for the published Google Sheet and for the Drive/Sheets APIs,
+# with configurable latency and injected failures. Fully offline.
+#   python3 benchmarks/fakeserver.py --port 8765 --latency 0.2 --fail-rate 0.05
+#
+# Sheets CSV:  GET /sheets/<rows>/<tab>.csv    (synthetic tabs, see synth.py)
+# Drive v3:    files create/update (multipart + resumable), list, update,
+#              delete, permissions.create, and /batch/drive/v3
+# Sheets v4:   spreadsheets.values get/update
+# Links:       GET/HEAD /links/<kind>[/<arg>]/<id> for the link checker:
+#              ok, slow/<ms>, redirect/<hops>, dead (404), gone (410),
+#              nohead (405 to HEAD, 200 to GET), error (500), blocked (403)
+import argparse, email.parser, email.policy, json, random, re, sys, threading, time, uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from . import synth
+except ImportError:
+    import synth
+
+DATA_DIR = Path(".cache/bench")
+
+
+class FakeGoogle:
+    """In-memory Drive + Sheets state shared by all handler threads."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.files = {}      # id -> {"id", "name", "trashed", "size", "revisions"}
+        self.uploads = {}    # upload_id -> {"meta", "file_id", "total", "received"}
+        self.cells = {}      # (spreadsheet, range) -> values
+        self.calls = 0       # API calls, counting each batched item
+        self.round_trips = 0
+        self.link_requests = {"HEAD": 0, "GET": 0}
+        self.link_inflight = {}   # Host header -> requests being served
+        self.link_peak = {}       # Host header -> most served at once
+
+    def add_file(self, name, size=0):
+        fid = uuid.uuid4().hex[:16]
+        self.files[fid] = {"id": fid, "name": name, "trashed": False, "size": size, "revisions": 1}
+        return fid
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FakeGoogle/1.0"
+
+    def log_message(self, *args):
+        pass
+
+    # --- plumbing ---
+    def _delay_or_fail(self):
+        cfg = self.server.cfg
+        delay = cfg.latency + random.uniform(0, cfg.jitter)
+        if cfg.spike_rate and random.random() < cfg.spike_rate:
+            delay += cfg.spike_latency
+        if delay:
+            time.sleep(delay)
+        if cfg.fail_rate and random.random() < cfg.fail_rate:
+            self._send(503, {"error": {"code": 503, "message": "injected failure"}})
+            return True
+        return False
+
+    def _body(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(n) if n else b""
+
+    def _send(self, status, payload=None, headers=None, raw=None, ctype="application/json"):
+        data = raw if raw is not None else (json.dumps(payload).encode() if payload is not None else b"")
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        if data or status not in (204, 304):
+            self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body = self._body() if method in ("POST", "PUT", "PATCH") else b""
+        if url.path.startswith("/sheets/") and method == "GET":
+            return self._sheet_csv(url.path)
+        if url.path.startswith("/links/") and method in ("GET", "HEAD"):
+            return self._link(method, url.path)
+        if self._delay_or_fail():
+            return
+        g = self.server.google
+        with g.lock:
+            g.round_trips += 1
+        if url.path == "/batch/drive/v3" and method == "POST":
+            return self._batch(body)
+        status, payload, headers = self.api(method, url.path, query, body, self.headers)
+        self._send(status, payload, headers)
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_HEAD(self):
+        self._route("HEAD")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_PUT(self):
+        self._route("PUT")
+
+    def do_PATCH(self):
+        self._route("PATCH")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    # --- published CSV ---
+    def _sheet_csv(self, path):
+        m = re.fullmatch(r"/sheets/(\d+)/(\w+)\.csv", path)
+        if not m or m.group(2) not in synth.TABS:
+            return self._send(404, {"error": "no such tab"})
+        rows, tab = int(m.group(1)), m.group(2)
+        csv_path = synth.ensure_sheets(self.server.cfg.data_dir / str(rows), rows)[tab]
+        st = csv_path.stat()
+        etag = f'"{st.st_size:x}-{int(st.st_mtime):x}"'
+        if self._delay_or_fail():
+            return
+        if self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers={"ETag": etag})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(st.st_size))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        with open(csv_path, "rb") as f:
+            while chunk := f.read(1 << 16):
+                self.wfile.write(chunk)
+
+    # --- links ---
+    def _link(self, method, path):
+        g, host = self.server.google, self.headers.get("Host", "")
+        with g.lock:
+            g.link_requests[method] += 1
+            g.link_inflight[host] = g.link_inflight.get(host, 0) + 1
+            g.link_peak[host] = max(g.link_peak.get(host, 0), g.link_inflight[host])
+        try:
+            parts = path.split("/")[2:]  # kind, [arg], id
+            kind, arg = parts[0], parts[1] if len(parts) > 2 else None
+            if kind == "slow":
+                time.sleep(int(arg) / 1000)
+            if kind == "redirect" and int(arg) > 0:
+                hops = int(arg) - 1
+                target = f"/links/redirect/{hops}/{parts[-1]}" if hops else f"/links/ok/{parts[-1]}"
+                return self._send(301 if hops % 2 else 302, headers={"Location": target}, raw=b"")
+            status = {"dead": 404, "gone": 410, "error": 500, "blocked": 403}.get(kind, 200)
+            if kind == "nohead" and method == "HEAD":
+                status = 405
+            if method == "HEAD":
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send(status, raw=b"<html>" + b"x" * 4096 + b"</html>", ctype="text/html")
+        finally:
+            with g.lock:
+                g.link_inflight[host] -= 1
+
+    # --- Drive / Sheets REST ---
+    def api(self, method, path, query, body, headers):
+        g = self.server.google
+        with g.lock:
+            g.calls += 1
+            return self._api_locked(g, method, path, query, body, headers)
+
+    def _api_locked(self, g, method, path, query, body, headers):
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        m = re.fullmatch(r"/upload/drive/v3/files(?:/(\w+))?", path)
+        if m:
+            file_id = m.group(1)
+            if file_id and file_id not in g.files:
+                return 404, {"error": {"code": 404, "message": "File not found"}}, {}
+            kind = query.get("uploadType")
+            upload_id = query.get("upload_id")
+            if kind == "resumable" and upload_id:
+                return self._resumable_chunk(g, upload_id, body, headers)
+            if kind == "resumable":
+                meta = json.loads(body or b"{}")
+                upload_id = uuid.uuid4().hex
+                total = int(headers.get("X-Upload-Content-Length") or -1)
+                g.uploads[upload_id] = {"meta": meta, "file_id": file_id, "total": total, "received": 0}
+                loc = f"{host}{path}?uploadType=resumable&upload_id={upload_id}"
+                return 200, None, {"Location": loc}
+            # multipart: metadata + media in one request
+            return 200, self._store(g, file_id, {}, len(body)), {}
+        m = re.fullmatch(r"/drive/v3/files", path)
+        if m and method == "GET":
+            q = query.get("q", "")
+            name = re.search(r"name = '([^']*)'", q)
+            files = [f for f in g.files.values()
+                     if not f["trashed"] and (not name or f["name"] == name.group(1))]
+            return 200, {"files": [{"id": f["id"], "name": f["name"]} for f in files]}, {}
+        m = re.fullmatch(r"/drive/v3/files/(\w+)(/permissions)?", path)
+        if m:
+            f = g.files.get(m.group(1))
+            if f is None:
+                return 404, {"error": {"code": 404, "message": "File not found"}}, {}
+            if m.group(2) and method == "POST":
+                f["public"] = True
+                return 200, {"id": "anyoneWithLink", "type": "anyone", "role": "reader"}, {}
+            if method == "PATCH":
+                f.update(json.loads(body or b"{}"))
+                return 200, {"id": f["id"], "name": f["name"]}, {}
+            if method == "DELETE":
+                del g.files[f["id"]]
+                return 204, None, {}
+            return 200, {"id": f["id"], "name": f["name"]}, {}
+        m = re.fullmatch(r"/v4/spreadsheets/([^/]+)/values/(.+)", path)
+        if m:
+            key = (m.group(1), m.group(2))
+            if method == "PUT":
+                values = json.loads(body or b"{}").get("values", [])
+                g.cells[key] = values
+                return 200, {"updatedCells": sum(len(r) for r in values)}, {}
+            return 200, {"range": m.group(2), "values": g.cells.get(key, [])}, {}
+        return 404, {"error": {"code": 404, "message": f"no route for {method} {path}"}}, {}
+
+    def _store(self, g, file_id, meta, size):
+        if file_id:
+            f = g.files[file_id]
+            f["size"], f["revisions"] = size, f["revisions"] + 1
+            return {"id": file_id}
+        return {"id": g.add_file(meta.get("name", "untitled"), size)}
+
+    def _resumable_chunk(self, g, upload_id, body, headers):
+        up = g.uploads.get(upload_id)
+        if up is None:
+            return 404, {"error": {"code": 404, "message": "upload session not found"}}, {}
+        rng = headers.get("Content-Range", "")
+        m = re.fullmatch(r"bytes (\d+)-(\d+)/(\d+|\*)", rng)
+        if m:
+            start, end = int(m.group(1)), int(m.group(2))
+            if start != up["received"]:
+                return 308, None, {"Range": f"bytes=0-{up['received'] - 1}"} if up["received"] else {}
+            up["received"] = end + 1
+            if m.group(3) != "*":
+                up["total"] = int(m.group(3))
+        elif rng.startswith("bytes */"):  # status query after an interruption
+            up["total"] = int(rng.split("/")[1])
+        if up["total"] >= 0 and up["received"] >= up["total"]:
+            del g.uploads[upload_id]
+            return 200, self._store(g, up["file_id"], up["meta"], up["received"]), {}
+        return 308, None, {"Range": f"bytes=0-{up['received'] - 1}"} if up["received"] else {}
+
+    def _batch(self, body):
+        ctype = self.headers.get("Content-Type", "")
+        msg = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            b"Content-Type: " + ctype.encode() + b"\r\n\r\n" + body)
+        boundary = "batch_" + uuid.uuid4().hex
+        parts = []
+        for part in msg.iter_parts():
+            content_id = (part.get("Content-ID") or "").strip("<>")
+            raw = part.get_payload(decode=True) or b""
+            head, _, inner_body = raw.partition(b"\r\n\r\n")
+            if not _:
+                head, _, inner_body = raw.partition(b"\n\n")
+            request_line, *hdr_lines = head.decode().splitlines()
+            method, target, _ = request_line.split(" ", 2)
+            inner_headers = dict(h.split(": ", 1) for h in hdr_lines if ": " in h)
+            url = urlsplit(target)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            path = url.path if not url.path.startswith("http") else urlsplit(url.path).path
+            cfg = self.server.cfg
+            if cfg.fail_rate and random.random() < cfg.fail_rate:
+                status, payload = 503, {"error": {"code": 503, "message": "injected failure"}}
+            else:
+                status, payload, _h = self.api(method, path, query, inner_body.strip(), inner_headers)
+            data = json.dumps(payload).encode() if payload is not None else b""
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n"
+                f"Content-Length: {len(data)}\r\n\r\n".encode() + data + b"\r\n")
+        raw = b"".join(parts) + f"--{boundary}--\r\n".encode()
+        self._send(200, raw=raw, ctype=f"multipart/mixed; boundary={boundary}")
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, jitter=0.0, fail_rate=0.0,
+                 spike_rate=0.0, spike_latency=0.0, data_dir=DATA_DIR):
+        super().__init__(("127.0.0.1", port), Handler)
+        self.cfg = argparse.Namespace(latency=latency, jitter=jitter, fail_rate=fail_rate,
+                                      spike_rate=spike_rate, spike_latency=spike_latency,
+                                      data_dir=Path(data_dir))
+        self.google = FakeGoogle()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def sheet_url(self, rows, tab):
+        return f"{self.base_url}/sheets/{rows}/{tab}.csv"
+
+    def link_url(self, kind, ident, host="127.0.0.1"):
+        """A /links/ URL; `host` may be "localhost" to look like a second site."""
+        return f"http://{host}:{self.server_address[1]}/links/{kind}/{ident}"
+
+    def handle_error(self, request, client_address):
+        # clients that hang up early (a hedged request that lost, a HEAD-then-GET
+        # probe) are expected; anything else is still reported
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def google_services(server):
+    """Drive and Sheets clients (googleapiclient) pointed at the fake server,
+    built from cv_sync_google's cached discovery documents."""
+    from google.auth.credentials import AnonymousCredentials
+    from googleapiclient.discovery import build_from_document
+    import cv_sync_google
+
+    out = []
+    for api, version in (("drive", "v3"), ("sheets", "v4")):
+        doc = json.loads(cv_sync_google._discovery_doc(api, version))
+        doc["rootUrl"] = server.base_url + "/"
+        doc["baseUrl"] = server.base_url + "/" + doc.get("servicePath", "")
+        out.append(build_from_document(doc, credentials=AnonymousCredentials()))
+    return tuple(out)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay, seconds")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    ap.add_argument("--spike-rate", type=float, default=0.0, help="fraction of requests delayed by --spike-latency")
+    ap.add_argument("--spike-latency", type=float, default=0.0)
+    args = ap.parse_args()
+    srv = FakeServer(args.port, args.latency, args.jitter, args.fail_rate, args.spike_rate, args.spike_latency)
+    print(f"Serving on {srv.base_url} (e.g. {srv.sheet_url(1000, 'publications')})")
+    srv.serve_forever()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# Offline benchmark suite for the resume pipeline.
+#   python3 benchmarks/run_benchmarks.py [--sizes 10,1000,100000] [--latency 0.05]
+#   python3 benchmarks/run_benchmarks.py --save-baseline      # record benchmarks/baseline.json
+#   python3 benchmarks/run_benchmarks.py --sizes 1000000      # the 1M-row run, opt-in
+#
+# Synthetic tabs (synth.py) are served by a local stand-in for the published
+# sheet and the Drive/Sheets APIs (fakeserver.py), so nothing leaves the
+# machine. Each stage x size runs in its own interpreter, which gives a clean
+# peak RSS and keeps one stage's caches out of the next one's numbers.
+#
+# Stages:
+#   fetch      fetch_all() of every tab over HTTP (parse included)
+#   normalize  tag index + iter_records() over already-parsed rows
+#   build      build_sections() over already-parsed rows
+#   generate   build_and_compile.main(): fetch + build + write .tex
+#   stream     the same with --stream
+#   drive      upload + cleanup batch + sheet update (needs google-api-python-client)
+#
+# Results are compared against the baseline (if any); a stage that got slower
+# or bigger than --threshold exits 1.
+import argparse, json, os, resource, subprocess, sys, tempfile, time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(HERE), str(Path(__file__).resolve().parent)]
+
+import synth
+from fakeserver import FakeServer
+
+DATA_DIR      = HERE / ".cache" / "bench"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+STAGES        = ["fetch", "normalize", "build", "generate", "stream", "drive"]
+DEFAULT_SIZES = [10, 1000, 100000]
+THRESHOLD     = 0.25   # fractional slowdown / growth that counts as a regression
+MIN_DELTA_S   = 0.05   # ignore wall-time changes smaller than this (timer noise on tiny runs)
+DRIVE_PDF_MB  = 4      # size of the synthetic PDF for the drive stage
+
+# synthetic tab -> URL constant in build_and_compile
+TAB_URLS = {
+    "publications": "PUBS_CSV",
+    "patents":      "PATENTS_CSV",
+    "achievements": "ACHIEVEMENTS_CSV",
+    "education":    "EDUCATION_CSV",
+    "research":     "RESEARCH_CSV",
+    "experience":   "EXPERIENCE_CSV",
+    "skills":       "SKILLS_CSV",
+}
+
+
+# --- child side: one stage, one size ---
+def _peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def _point_at(bc, base_url, size):
+    for tab, const in TAB_URLS.items():
+        setattr(bc, const, f"{base_url}/sheets/{size}/{tab}.csv")
+    return [getattr(bc, c) for c in TAB_URLS.values()]
+
+def _local_tabs(bc, size):
+    """{url: rows} parsed straight from the synthetic files (untimed setup)."""
+    paths = synth.ensure_sheets(DATA_DIR / str(size), size)
+    return {getattr(bc, TAB_URLS[tab]): bc._parse_csv(p.read_bytes()) for tab, p in paths.items()}
+
+def _normalize_all(bc, tabs):
+    index = bc.TagIndex(tabs)
+    for url in bc.tagged_tabs():
+        for _ in index.select(url):
+            pass
+    for _ in bc.iter_records(bc.EDU_SCHEMA, tabs[bc.EDUCATION_CSV]):
+        pass
+    return sum(map(len, tabs.values()))
+
+def _drive_stage(size):
+    import cv_sync_google as s
+    s._import_google()
+    with FakeServer() as server:
+        drive, sheets = __import__("fakeserver").google_services(server)
+        # previous copies for the cleanup batch to trash: one per 1k rows, capped
+        for _ in range(min(max(size // 1000, 1), 500)):
+            server.google.add_file(s.DRIVE_FILE_NAME)
+        pdf = Path("bench.pdf")
+        with open(pdf, "wb") as f:
+            f.write(os.urandom(DRIVE_PDF_MB * 1024 * 1024))
+        t = time.perf_counter()
+        file_id = s.upload_file_to_drive(drive, str(pdf), s.DRIVE_FILE_NAME)
+        s.replace_previous_and_share(drive, s.DRIVE_FILE_NAME, file_id)
+        s.update_sheet(sheets, s.SPREADSHEET_ID, s.SHEET_NAME, file_id)
+        wall = time.perf_counter() - t
+        return wall, len(server.google.files), {"round_trips": server.google.round_trips,
+                                                 "api_calls": server.google.calls}
+
+def run_child(stage, size, base_url):
+    import build_and_compile as bc
+    urls = _point_at(bc, base_url, size)
+    bc.SITE_BUNDLE = False  # the website tabs are not part of the synthetic sheet
+    extra = {}
+    with tempfile.TemporaryDirectory() as work:
+        os.chdir(work)  # .tex output, caches and upload state stay out of the repo
+        Path("sections").mkdir()
+        if stage == "fetch":
+            t = time.perf_counter()
+            tabs = bc.fetch_all(urls, use_cache=False)
+            wall = time.perf_counter() - t
+            rows = sum(map(len, tabs.values()))
+        elif stage == "normalize":
+            tabs = _local_tabs(bc, size)
+            t = time.perf_counter()
+            rows = _normalize_all(bc, tabs)
+            wall = time.perf_counter() - t
+        elif stage == "build":
+            tabs = _local_tabs(bc, size)
+            rows = sum(map(len, tabs.values()))
+            t = time.perf_counter()
+            out = bc.build_sections(tabs)
+            wall = time.perf_counter() - t
+            extra["tex_bytes"] = sum(len(v) for v in out.values())
+        elif stage in ("generate", "stream"):
+            argv = ["--no-cache"] + (["--stream"] if stage == "stream" else [])
+            t = time.perf_counter()
+            with open(os.devnull, "w") as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    bc.main(argv)
+                finally:
+                    sys.stdout = stdout
+            wall = time.perf_counter() - t
+            rows = size * len(TAB_URLS)
+            extra["tex_bytes"] = sum(p.stat().st_size for p in Path("sections").iterdir())
+        elif stage == "drive":
+            wall, rows, extra = _drive_stage(size)
+        else:
+            raise SystemExit(f"unknown stage {stage!r}")
+    result = {"stage": stage, "size": size, "wall_s": round(wall, 4), "rows": rows,
+              "rows_per_s": round(rows / wall) if wall else None,
+              "peak_rss_mb": round(_peak_rss_mb(), 1), **extra}
+    print(json.dumps(result))
+
+
+# --- parent side ---
+def run_stage(stage, size, base_url):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(HERE), os.environ.get("PYTHONPATH")])))
+    p = subprocess.run([sys.executable, str(Path(__file__).resolve()), "--child", stage, str(size), base_url],
+                       cwd=HERE, env=env, capture_output=True, text=True)
+    if p.returncode != 0:
+        lines = (p.stderr.strip() or p.stdout.strip() or "no output").splitlines()
+        return {"stage": stage, "size": size, "error": lines[-1]}
+    return json.loads(p.stdout.strip().splitlines()[-1])
+
+def have_google():
+    p = subprocess.run([sys.executable, "-c", "import googleapiclient, google.auth"], capture_output=True)
+    return p.returncode == 0
+
+def compare(results, baseline, threshold, min_delta):
+    """List of human-readable regressions against the baseline."""
+    regressions = []
+    for r in results:
+        base = baseline.get(f"{r['stage']}@{r['size']}")
+        if not base or "error" in r or "error" in base:
+            continue
+        if r["wall_s"] > base["wall_s"] * (1 + threshold) and r["wall_s"] - base["wall_s"] > min_delta:
+            regressions.append(f"{r['stage']}@{r['size']}: wall {base['wall_s']:.3f}s -> {r['wall_s']:.3f}s")
+        if r["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+            regressions.append(f"{r['stage']}@{r['size']}: peak RSS {base['peak_rss_mb']:.0f} MB -> {r['peak_rss_mb']:.0f} MB")
+    return regressions
+
+def _fmt(r):
+    if "error" in r:
+        return f"{r['stage']:10s} {r['size']:>9,d}  FAILED: {r['error']}"
+    rate = f"{r['rows_per_s']:>12,d} rows/s" if r.get("rows_per_s") else " " * 19
+    return f"{r['stage']:10s} {r['size']:>9,d}  {r['wall_s']:9.3f} s {rate}  {r['peak_rss_mb']:8.1f} MB peak"
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Offline benchmarks for the resume pipeline.")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                    help="comma-separated rows per tab (default %(default)s; 1000000 for the big run)")
+    ap.add_argument("--stages", default=",".join(STAGES), help="comma-separated subset of " + ", ".join(STAGES))
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds per request")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay per request")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="allowed fractional slowdown / RSS growth (default %(default)s)")
+    ap.add_argument("--json", type=Path, help="also write the raw results here")
+    ap.add_argument("--child", nargs=3, metavar=("STAGE", "SIZE", "BASE_URL"), help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.child:
+        stage, size, base_url = args.child
+        return run_child(stage, int(size), base_url)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    stages = [s for s in args.stages.split(",") if s]
+    if "drive" in stages and not have_google():
+        print("drive      skipped (google-api-python-client not installed)")
+        stages.remove("drive")
+
+    for size in sizes:  # generate up front so it is not timed
+        t = time.perf_counter()
+        synth.ensure_sheets(DATA_DIR / str(size), size)
+        if time.perf_counter() - t > 1:
+            print(f"generated {size:,d}-row tabs in {time.perf_counter() - t:.1f}s")
+
+    results = []
+    with FakeServer(latency=args.latency, jitter=args.jitter, fail_rate=args.fail_rate,
+                    data_dir=DATA_DIR) as server:
+        for size in sizes:
+            for stage in stages:
+                r = run_stage(stage, size, server.base_url)
+                results.append(r)
+                print(_fmt(r))
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        baseline = {f"{r['stage']}@{r['size']}": r for r in results if "error" not in r}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}.")
+        return 0
+    if not args.baseline.exists():
+        print("No baseline to compare against (use --save-baseline).")
+        return 1 if any("error" in r for r in results) else 0
+    regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")),
+                          args.threshold, MIN_DELTA_S)
+    for line in regressions:
+        print("REGRESSION " + line)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}.")
+    return 1 if regressions or any("error" in r for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Synthetic spreadsheet tabs for benchmarking, shaped like the real sheet.
+#   python3 benchmarks/synth.py --rows 1000 --out .cache/bench/1000
+import argparse, csv, random
+from pathlib import Path
+
+FIRST = ["Rwik", "Joydeep", "Amanda", "Jesse", "Dongmyeong", "Christian", "Garrett", "Byron",
+         "Guanya", "Kevin", "Alex", "Jacob", "Praveen", "Madhu", "Suraj", "Priya", "Wei", "Ana"]
+LAST  = ["Rana", "Biswas", "Adkins", "Quattrociocchi", "Lee", "Ellis", "Warnell", "Boots",
+         "Shi", "Huang", "Spitzer", "Sacks", "Venkatesh", "Vadali", "Borate", "Iyer", "Zhang", "Silva"]
+WORDS = ["learning", "robot", "off-road", "navigation", "model", "predictive", "control", "quadrotor",
+         "trajectory", "tracking", "satellite", "costmap", "open-vocabulary", "particle", "filter",
+         "planning", "multi-robot", "adaptive", "deep", "policy", "100%", "R&D", "C++", "$O(n)$", "#1"]
+VENUES = ["ICRA 2024", "CoRL 2023", "RSS 2025 Workshop on Resilient Off-road Autonomy",
+          "IROS 2022", "Journal of Mechanisms and Robotics", "NeurIPS 2024"]
+TAGS = ["resume", "resume; website", "website", "paper, resume", "", "talk"]
+COMPANIES = ["UT Austin AMRL", "University of Washington", "IIT Gandhinagar", "Acme Robotics", "NVIDIA"]
+
+# column order per tab, as in the published sheet
+HEADERS = {
+    "publications": ["title", "authors", "venue", "link", "tag"],
+    "patents":      ["title", "authors", "venue", "link", "tag"],
+    "achievements": ["latex update", "tag"],
+    "education":    ["Institution", "Program", "Affiliations", "Courses", "Dates", "Location"],
+    "research":     ["Research Interest", "tag"],
+    "experience":   ["Company", "Team", "Experience", "Advisors", "Description", "Position",
+                     "Company Date", "tag", "Paper Link", "Code Link", "Project Website",
+                     "Video Link", "Image Link"],
+    "skills":       ["Libraries", "Coding", "Tools", "Languages"],
+}
+TABS = list(HEADERS)
+
+def _name(rnd):
+    return f"{rnd.choice(FIRST)} {rnd.choice(LAST)}"
+
+def _words(rnd, lo, hi):
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(lo, hi)))
+
+def _url(rnd, kind):
+    return f"https://example.org/{kind}/{rnd.randrange(10**9):09d}?ref=cv_{rnd.randrange(100)}"
+
+def make_row(tab, i, rnd):
+    if tab in ("publications", "patents"):
+        authors = ", ".join(_name(rnd) for _ in range(rnd.randint(3, 12)))
+        return [_words(rnd, 5, 14).capitalize(), authors, rnd.choice(VENUES), _url(rnd, "paper"), rnd.choice(TAGS)]
+    if tab == "achievements":
+        return [rf"\textbf{{{_words(rnd, 2, 4).title()}}} award for {_words(rnd, 4, 10)} ({2015 + i % 10})",
+                rnd.choice(TAGS)]
+    if tab == "education":
+        return [rnd.choice(COMPANIES), f"M.S. {_words(rnd, 1, 3)}; {_words(rnd, 2, 4)}", _words(rnd, 2, 5),
+                ", ".join(_words(rnd, 1, 3) for _ in range(4)), f"20{10 + i % 15}-20{12 + i % 15}", "Austin, TX"]
+    if tab == "research":
+        return [_words(rnd, 30, 80) + ".\n" + _words(rnd, 10, 30) + ".", rnd.choice(TAGS)]
+    if tab == "experience":
+        block = i // 3  # a few projects per (company, position, date)
+        bullets = "; ".join(_words(rnd, 8, 20) for _ in range(rnd.randint(2, 5)))
+        links = [_url(rnd, k) if rnd.random() < 0.5 else "" for k in ("paper", "code", "site", "video", "image")]
+        return [COMPANIES[block % len(COMPANIES)], _words(rnd, 1, 3), _words(rnd, 3, 6), _name(rnd), bullets,
+                "Graduate Researcher", f"20{10 + block % 15}", rnd.choice(TAGS)] + links
+    if tab == "skills":
+        return [_words(rnd, 1, 2) if rnd.random() < 0.7 else "" for _ in HEADERS["skills"]]
+    raise ValueError(f"unknown tab {tab!r}")
+
+def write_tab(path, tab, rows, seed=0):
+    """Write one synthetic tab as CSV (same dialect as the Sheets export)."""
+    rnd = random.Random(f"{seed}:{tab}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f, lineterminator="\r\n")
+        w.writerow(HEADERS[tab])
+        for i in range(rows):
+            w.writerow(make_row(tab, i, rnd))
+    return path
+
+def ensure_sheets(out_dir, rows, seed=0):
+    """{tab: csv path} for every tab at the given size, generating missing files."""
+    out_dir = Path(out_dir)
+    paths = {}
+    for tab in TABS:
+        p = out_dir / f"{tab}.csv"
+        if not p.exists():
+            tmp = write_tab(p.with_suffix(".tmp"), tab, rows, seed)
+            tmp.replace(p)
+        paths[tab] = p
+    return paths
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1000)
+    ap.add_argument("--out", default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    for tab, p in ensure_sheets(args.out or f".cache/bench/{args.rows}", args.rows, args.seed).items():
+        print(f"{tab:13s} {p}  {p.stat().st_size / 1e6:.1f} MB")
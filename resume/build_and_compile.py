@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
 # pip install requests
-import csv, io, re, requests
+import argparse, codecs, csv, gzip, hashlib, io, json, os, random, re, shutil, subprocess, sys, threading, time, zipfile, requests
+import xml.etree.ElementTree as ET
+from functools import lru_cache, partial
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
+from urllib.parse import parse_qs, urlsplit
+from requests.adapters import HTTPAdapter
+
+import fetch_policy, tracing
 
 # === Your published CSVs ===
 PUBS_CSV  = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=0&single=true&output=csv"
@@ -12,6 +22,33 @@ EDUCATION_CSV    = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8
 RESEARCH_CSV     = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=309578428&single=true&output=csv"
 EXPERIENCE_CSV   = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=322365384&single=true&output=csv"  # e.g., ".../pub?gid=123456789&single=true&output=csv"
 SKILLS_CSV = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=2062416334&single=true&output=csv"
+# only used by the website (see SITE_TABS)
+CV_CSV       = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=379735365&single=true&output=csv"
+PROJECTS_CSV = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?gid=2102024018&single=true&output=csv"
+
+TAB_NAMES = {  # tab URL -> short name for messages and traces
+    PUBS_CSV:         "Publications",
+    PATENTS_CSV:      "Patents",
+    ACHIEVEMENTS_CSV: "Achievements",
+    EDUCATION_CSV:    "Education",
+    RESEARCH_CSV:     "Research Interest",
+    EXPERIENCE_CSV:   "Experience",
+    SKILLS_CSV:       "Skills",
+    CV_CSV:           "CV",
+    PROJECTS_CSV:     "Projects",
+}
+
+# === Bulk ingestion: the whole workbook in one request ===
+# "csv" fetches each *_CSV tab separately; "workbook" downloads WORKBOOK_URL once
+# (xlsx export of the same published spreadsheet, or a local .xlsx path) and
+# splits it into sheets. A tab's sheet is found by the gid in its CSV URL,
+# using the gid -> title list on the spreadsheet's publish page
+# (WORKBOOK_INDEX_URL). Tabs not found that way, and sheets with
+# number-formatted cells (dates, percents...; the xlsx holds only the raw
+# number, the CSV the formatted text), fall back to CSV.
+INGEST_MODE  = "csv"
+WORKBOOK_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pub?output=xlsx"
+WORKBOOK_INDEX_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTbczS5lAOV8I8NLH4srTn72hmEEEjsS10aIqMRIu7ogTKiMYhqrEYBnUfWXw77M8bnQBNKMUoucVJl/pubhtml"
 
 # === Output paths (match your \input{}s) ===
 PUBS_TEX = Path("sections/publications.tex")
@@ -21,127 +58,839 @@ RES_TEX  = Path("sections/research.tex")
 EXP_TEX  = Path("sections/experience.tex")
 SKL_TEX  = Path("sections/skills.tex")
 
+# === Website data bundle (../index.html) ===
+# The tabs the site renders, written as one content-hashed JSON file (plus .gz
+# and, with the brotli module installed, .br copies for servers that send
+# precompressed files) that index.html loads in one same-origin request. The
+# page falls back to fetching each CSV from Google if the bundle is missing.
+SITE_BUNDLE   = True
+SITE_ROOT     = Path("..")
+SITE_INDEX    = SITE_ROOT / "index.html"
+SITE_DATA_DIR = SITE_ROOT / "assets" / "data"
+SITE_KEEP     = 2   # newest bundles kept, so a cached index.html still finds its data
+SITE_TABS = {       # bundle key -> tab, as index.html's *_CSV_URL constants
+    "cv":           CV_CSV,
+    "publications": PUBS_CSV,
+    "patents":      PATENTS_CSV,
+    "projects":     PROJECTS_CSV,
+    "news":         ACHIEVEMENTS_CSV,  # the page's NEWS_CSV_URL is this tab
+}   # RESEARCH_INTEREST_CSV_URL is still a placeholder in index.html
+
 # === Formatting knobs ===
 MY_NAME = "Rwik Rana"
 INCLUDE_LINK = True
 MERGE_MODE   = "pubs_then_patents"
 
+# === Fetching knobs ===
+FETCH_WORKERS = 4      # tabs downloaded in parallel over one keep-alive session
+FETCH_TIMEOUT = 30     # seconds, per tab (per attempt with FETCH_POLICY: the ceiling)
+TAB_TIMEOUTS  = {}     # optional per-tab overrides, e.g. {SKILLS_CSV: 10}
+FETCH_POLICY  = True   # retries, hedging, adaptive timeouts, circuit breaker (fetch_policy.py)
+BUILD_DEADLINE = 120   # seconds all fetches of one build may take (--deadline); None for no limit
+STREAM_CHUNK  = 64 * 1024  # bytes per read in --stream mode
+
+# === On-disk HTTP cache (conditional requests + offline fallback) ===
+USE_CACHE       = True
+CACHE_DIR       = Path(".cache/sheets")
+CACHE_MAX_AGE   = 30 * 24 * 3600     # seconds since last use before an entry is evicted
+CACHE_MAX_BYTES = 50 * 1024 * 1024   # total size; least recently used entries go first
+CACHE_FORMAT    = 3                  # bump when the stored row layout changes
+
+# === Watch mode (--watch) ===
+WATCH_INTERVAL    = 60    # seconds between polls of one tab
+WATCH_INTERVALS   = {}    # per-tab overrides, e.g. {SKILLS_CSV: 600}
+WATCH_JITTER      = 0.2   # +-20% on every interval so tabs do not poll in lockstep
+WATCH_MAX_BACKOFF = 900   # interval ceiling while a tab keeps failing
+WATCH_DEBOUNCE    = 5     # seconds without further changes before sections are rewritten
+WATCH_SETTLE      = 3     # seconds the PDF must stay unchanged before it is synced
+WATCH_TICK        = 0.5
+WATCH_LATEXMK_CMD = ["latexmk", "-pdf", "-pvc", "-view=none", "-interaction=nonstopmode",
+                     "-jobname=output/generated_resume", "main.tex"]
+
 # === Helpers ===
 LATEX_ESC_PLAIN = [
     ("\\", r"\\textbackslash{}"),
     ("&",  r"\&"), ("%", r"\%"), ("$", r"\$"), ("#", r"\#"), ("_", r"\_"),
     ("{",  r"\{"), ("}",  r"\}"), ("~", r"\textasciitilde{}"), ("^", r"\textasciicircum{}"),
 ]
-def esc_plain(s:str)->str:
-    s = (s or "").strip()
-    for a,b in LATEX_ESC_PLAIN: s = s.replace(a,b)
-    return s
-
 LATEX_ESC_EDU = [
     ("&",  r"\&"), ("%", r"\%"), ("$", r"\$"), ("#", r"\#"), ("_", r"\_"),
     ("~", r"\textasciitilde{}"), ("^", r"\textasciicircum{}"),
 ]
-def esc_edu(s:str)->str:
-    s = (s or "").strip()
-    for a,b in LATEX_ESC_EDU: s = s.replace(a,b)
+# \href targets: hyperref takes the URL nearly verbatim; only % and # must be
+# escaped so the argument survives being inside another macro.
+LATEX_ESC_URL = [
+    ("%", r"\%"), ("#", r"\#"),
+]
+
+# Escaping profiles. Each is applied as a chain of str.replace calls: in
+# CPython replace() returns its input untouched when the needle is absent, so
+# clean fields cost one scan per needle and no copies, and on escape-dense
+# text the chain beat single-pass str.translate / regex dispatch by 3-6x
+# (benchmarks/bench_escape.py). The real saving is memoizing repeated strings.
+ESC_PROFILES = {
+    "plain": tuple(LATEX_ESC_PLAIN),
+    "edu":   tuple(LATEX_ESC_EDU),
+    "url":   tuple(LATEX_ESC_URL),
+}
+ESC_CACHE_SIZE = 8192  # author lists, venues and skill names repeat a lot
+
+@lru_cache(maxsize=ESC_CACHE_SIZE)
+def _escape(s:str, profile:str)->str:
+    s = s.strip()
+    for a, b in ESC_PROFILES[profile]:
+        s = s.replace(a, b)
     return s
 
+def latex_escape(s:str, profile:str="plain")->str:
+    """Escape s for LaTeX using the named profile ("plain", "edu" or "url")."""
+    return _escape(s or "", profile)
+
+def esc_plain(s:str)->str:
+    return _escape(s or "", "plain")
+
+def esc_edu(s:str)->str:
+    return _escape(s or "", "edu")
+
+def esc_url(s:str)->str:
+    return _escape(s or "", "url")
+
+_MY_NAME_RE = re.compile(r"(Rwik Rana|Rwik R\. Rana)")
+
+@lru_cache(maxsize=ESC_CACHE_SIZE)
 def bold_name(s:str)->str:
-    return re.sub(r"(Rwik Rana|Rwik R\. Rana)", r"\\textbf{\1}", s or "")
+    return _MY_NAME_RE.sub(r"\\textbf{\1}", s or "")
+
+_TAG_SPLIT = re.compile(r"[;,]")
+TAG_CACHE_SIZE = 4096  # distinct tag cells; a sheet reuses a handful of them
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def parse_tags(cell:str)->frozenset:
+    """The tags in a tag cell ("resume; website, Talk"), lowercased, as a
+    frozenset of interned strings. Parsed once per distinct cell."""
+    return frozenset(sys.intern(t) for t in (p.strip().lower() for p in _TAG_SPLIT.split(cell)) if t)
 
 def tag_has_resume(tag:str)->bool:
-    return any(p.strip().lower()=="resume" for p in re.split(r"[;,]", tag or ""))
+    return "resume" in parse_tags(tag or "")
 
-def fetch_rows(url:str):
-    r = requests.get(url, timeout=30); r.raise_for_status()
-    text = r.content.decode("utf-8-sig")
-    return list(csv.DictReader(io.StringIO(text)))
+# Row selection by tags (case-insensitive): at least one of any_of (when
+# given), every tag in all_of, and none in exclude. Build with tag_query().
+TagQuery = namedtuple("TagQuery", "any_of all_of exclude")
 
-# --- normalize rows (existing) ---
-def norm_pub_row(row:dict):
-    return {
-        "title":   (row.get("title")   or row.get("Title")   or "").strip(),
-        "authors": (row.get("authors") or row.get("Authors") or "").strip(),
-        "venue":   (row.get("venue")   or row.get("Venue")   or "").strip(),
-        "link":    (row.get("link")    or row.get("URL")     or row.get("Link") or "").strip(),
-        "tag":     (row.get("tag")     or row.get("Tag")     or "").strip(),
-    }
+def tag_query(any_of=(), all_of=(), exclude=()):
+    norm = lambda tags: frozenset(t.strip().lower() for t in ([tags] if isinstance(tags, str) else tags) if t.strip())
+    return TagQuery(norm(any_of), norm(all_of), norm(exclude))
 
-def norm_ach_row(row:dict):
-    def g(*keys):
-        for k in keys:
-            if k in row and row[k] is not None:
-                return str(row[k])
-        return ""
-    return {
-        "latex_update": g("latex update","latex_update","Latex update","Latex Update").strip(),
-        "tag": g("tag","Tag").strip(),
-    }
+RESUME_QUERY = tag_query(any_of=["resume"])
 
-def norm_edu_row(row:dict):
-    def g(k): return (row.get(k) or "").strip()
-    return {
-        "Institution": g("Institution"),
-        "Program":     g("Program"),
-        "Affiliations":g("Affiliations"),
-        "Courses":     g("Courses"),
-        "Dates":       g("Dates"),
-        "Location":    g("Location"),
+def as_tag_query(tags=None)->TagQuery:
+    """RESUME_QUERY for None, a TagQuery as is, else any of the given tags."""
+    if tags is None:
+        return RESUME_QUERY
+    return tags if isinstance(tags, TagQuery) else tag_query(any_of=tags)
+
+def tags_match(query:TagQuery, tags:frozenset)->bool:
+    """Whether a row's parse_tags() set satisfies the query."""
+    return ((not query.any_of or not tags.isdisjoint(query.any_of))
+            and query.all_of <= tags and tags.isdisjoint(query.exclude))
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+def get_session():
+    """One shared keep-alive session; all tabs live on the same host. The
+    first call usually comes from fetch_all's workers at once, hence the lock."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            s = requests.Session()
+            # room for a hedged duplicate of every request in flight
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, 2 * FETCH_WORKERS))
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _SESSION = s
+        return _SESSION
+
+# --- tables: the header once, then each row as a tuple ---
+class Table:
+    """One parsed tab: the header, then every row as a tuple of strings padded
+    to the header's width. Iterating yields the header first and then the
+    rows, the same shape iter_rows() streams, so readers accept either."""
+    __slots__ = ("header", "rows")
+
+    def __init__(self, header, rows):
+        self.header = tuple(header)
+        self.rows = rows
+
+    def __iter__(self):
+        yield self.header
+        yield from self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __eq__(self, other):
+        return isinstance(other, Table) and self.header == other.header and self.rows == other.rows
+
+    def __repr__(self):
+        return f"Table({len(self.header)} columns, {len(self.rows)} rows)"
+
+    def dicts(self):
+        """Rows as {column: value}, like csv.DictReader (later duplicate columns win)."""
+        return (dict(zip(self.header, r)) for r in self.rows)
+
+def _padded(records):
+    """Header, then each non-blank row as a tuple padded to the header's width
+    (blank lines are skipped, as csv.DictReader does)."""
+    it = iter(records)
+    header = tuple(next(it, ()))
+    yield header
+    width = len(header)
+    for r in it:
+        if not r:
+            continue
+        if len(r) < width:
+            r = list(r) + [""] * (width - len(r))
+        yield tuple(r)
+
+def _table(records)->Table:
+    """_padded() collected into a Table, in one list comprehension."""
+    it = iter(records)
+    header = tuple(next(it, ()))
+    pad = ("",) * len(header)
+    return Table(header, [tuple(r) if len(r) >= len(pad) else (*r, *pad[len(r):]) for r in it if r])
+
+def _to_json(data):
+    """Cache form of parsed rows: a Table, {sheet: Table or None} for a
+    workbook, or {gid: title} for its publish page."""
+    if isinstance(data, Table):
+        return {"__table__": list(data.header), "rows": data.rows}
+    if not isinstance(data, dict):
+        return data
+    return {k: _to_json(v) for k, v in data.items()}
+
+def _from_json(obj):
+    if not isinstance(obj, dict):
+        return obj
+    if "__table__" in obj:
+        return Table(obj["__table__"], [tuple(r) for r in obj["rows"]])
+    return {k: _from_json(v) for k, v in obj.items()}
+
+# --- disk cache: one JSON file per URL with validators + parsed rows ---
+def _cache_path(url:str)->Path:
+    return CACHE_DIR / (hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + ".json")
+
+def _cache_load(url:str):
+    p = _cache_path(url)
+    try:
+        entry = json.loads(p.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if entry.get("url") != url or entry.get("format") != CACHE_FORMAT:
+        return None  # hash collision or written by an older version
+    entry["rows"] = _from_json(entry["rows"])
+    return entry
+
+def _cache_store(url:str, resp, digest:str, rows):
+    entry = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "sha256": digest,
+        "fetched_at": time.time(),
+        "format": CACHE_FORMAT,
+        "rows": _to_json(rows),
     }
+    p = _cache_path(url)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, p)
+
+def _cache_touch(url:str):
+    try:
+        os.utime(_cache_path(url))
+    except OSError:
+        pass
+
+def prune_cache(max_age=None, max_bytes=None):
+    """Evict entries unused for longer than max_age, then the least recently
+    used ones until the cache fits in max_bytes. Returns number removed."""
+    max_age = CACHE_MAX_AGE if max_age is None else max_age
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not CACHE_DIR.is_dir():
+        return 0
+    now = time.time()
+    entries = []
+    for p in CACHE_DIR.glob("*.json"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+    entries.sort()  # oldest first
+    removed, total = 0, sum(size for _, size, _ in entries)
+    for mtime, size, p in entries:
+        if now - mtime <= max_age and total <= max_bytes:
+            break
+        try:
+            p.unlink()
+        except OSError:
+            continue
+        removed += 1
+        total -= size
+    return removed
+
+def _conditional_headers(entry):
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def _tab_label(url:str)->str:
+    """Short name for a tab URL in trace output."""
+    return TAB_NAMES.get(url) or ("workbook" if url == WORKBOOK_URL else url.rsplit("/", 1)[-1])
+
+def _warn_stale(url:str, entry, error):
+    when = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.get("fetched_at", 0)))
+    print(f"WARNING: fetching {url} failed ({error}); using cached copy from {when}.")
+
+def _parse_csv(body:bytes)->Table:
+    text = body.decode("utf-8-sig")
+    return _table(csv.reader(io.StringIO(text)))
+
+def _get(session, url:str, headers, timeout=None, stream=False):
+    """GET one tab, through fetch_policy unless FETCH_POLICY is off."""
+    timeout = timeout or TAB_TIMEOUTS.get(url, FETCH_TIMEOUT)
+    if not FETCH_POLICY:
+        return session.get(url, headers=headers, timeout=timeout, stream=stream)
+    return fetch_policy.get(session, url, headers=headers, timeout=timeout, stream=stream, label=_tab_label(url))
+
+def fetch_rows(url:str, session=None, timeout=None, use_cache=None, parse=None):
+    """Download and parse one tab. With the cache on, sends If-None-Match /
+    If-Modified-Since, reuses the cached rows on 304 (or on an identical
+    body), and falls back to the last good copy if the request fails.
+    `parse` turns the body into rows (CSV by default)."""
+    parse = parse or _parse_csv
+    session = session or get_session()
+    use_cache = USE_CACHE if use_cache is None else use_cache
+    with tracing.span(f"fetch {_tab_label(url)}", "fetch", url=url) as sp:
+        entry = _cache_load(url) if use_cache else None
+        try:
+            r = _get(session, url, _conditional_headers(entry), timeout)
+            if r.status_code == 304 and entry:
+                _cache_touch(url)
+                sp.set(status=304, rows=len(entry["rows"]))
+                return entry["rows"]
+            r.raise_for_status()
+        except requests.RequestException as error:
+            if not entry:
+                raise
+            _warn_stale(url, entry, error)
+            sp.set(status="stale", rows=len(entry["rows"]))
+            return entry["rows"]
+        sp.set(status=r.status_code, bytes=len(r.content))
+        digest = hashlib.sha256(r.content).hexdigest()
+        if entry and entry.get("sha256") == digest:
+            rows = entry["rows"]  # server ignored the validators, body is unchanged
+        else:
+            with tracing.span(f"parse {_tab_label(url)}", "parse", bytes=len(r.content)):
+                rows = parse(r.content)
+        sp.set(rows=len(rows))
+        if use_cache:
+            _cache_store(url, r, digest, rows)
+    return rows
+
+# --- streaming: rows flow from the socket to the .tex file one at a time ---
+def _iter_text_lines(chunks):
+    """Decode byte chunks (UTF-8, BOM stripped) into lines that keep their
+    "\n", which csv needs to handle quoted multi-line cells."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    for chunk in chunks:
+        lines = (tail + decoder.decode(chunk)).split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def iter_rows(url:str, session=None, timeout=None, use_cache=None):
+    """Streaming counterpart of fetch_rows: yields the header tuple, then each
+    row tuple as the body arrives, instead of holding the whole tab. A 304 (or a failed request)
+    replays the cached rows; fresh bodies are not stored in the cache, since
+    that would mean materializing them."""
+    session = session or get_session()
+    use_cache = USE_CACHE if use_cache is None else use_cache
+    # the span covers the whole stream, including time the consumer spends
+    # between rows; the section span it runs inside has the same extent
+    with tracing.span(f"stream {_tab_label(url)}", "fetch", url=url) as sp:
+        entry = _cache_load(url) if use_cache else None
+        try:
+            r = _get(session, url, _conditional_headers(entry), timeout, stream=True)
+            if r.status_code != 304 or not entry:
+                r.raise_for_status()
+        except requests.RequestException as error:
+            if not entry:
+                raise
+            _warn_stale(url, entry, error)
+            sp.set(status="stale")
+            yield entry["rows"].header
+            yield from tracing.counted(entry["rows"].rows, sp)
+            return
+        sp.set(status=r.status_code)
+        try:
+            if r.status_code == 304:
+                _cache_touch(url)
+                yield entry["rows"].header
+                yield from tracing.counted(entry["rows"].rows, sp)
+            else:
+                chunks = r.iter_content(STREAM_CHUNK)
+                if tracing.enabled():
+                    chunks = _count_bytes(chunks, sp)
+                records = _padded(csv.reader(_iter_text_lines(chunks)))
+                yield next(records)
+                yield from tracing.counted(records, sp)
+        finally:
+            r.close()
+
+def _count_bytes(chunks, sp):
+    for chunk in chunks:
+        sp.add(bytes=len(chunk))
+        yield chunk
+
+def fetch_all(urls, max_workers=None, use_cache=None):
+    """Fetch several tabs concurrently. Returns {url: rows} in the order given,
+    so everything generated from it stays deterministic. Placeholder
+    ("PASTE_...") and duplicate URLs are skipped."""
+    urls = list(dict.fromkeys(u for u in urls if u and not u.startswith("PASTE_")))
+    if not urls:
+        return {}
+    workers = max(1, min(max_workers or FETCH_WORKERS, len(urls)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fetch_rows, u, use_cache=use_cache) for u in urls]
+        return {u: f.result() for u, f in zip(urls, futures)}
+
+# --- bulk workbook (.xlsx) ingestion, stdlib only ---
+_XLSX_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_REL  = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL   = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+def _xlsx_col(ref:str)->int:
+    n = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        n = n * 26 + (ord(ch.upper()) - 64)
+    return n - 1
+
+def _xlsx_text(node)->str:
+    # <si>/<is>: plain <t> or rich-text runs <r><t>; skip phonetic <rPh>
+    parts = [t.text or "" for t in node.findall(f"{_XLSX_MAIN}t")]
+    parts += [t.text or "" for t in node.findall(f"{_XLSX_MAIN}r/{_XLSX_MAIN}t")]
+    return "".join(parts)
 
-def norm_research_row(row: dict):
-    text = (row.get("Research Interest") or row.get("Research Interests") or
-            row.get("research interest") or row.get("research interests") or "")
-    text = re.sub(r"\s*\n\s*", " ", text).strip()
-    tag  = (row.get("tag") or row.get("Tag") or "").strip()
-    return {"text": text, "tag": tag}
-
-# NEW: normalize experience rows
-def norm_experience_row(row:dict):
-    def g(*names):
-        for n in names:
-            if n in row and row[n] is not None:
-                return str(row[n]).strip()
+def _xlsx_value(c, shared)->str:
+    kind = c.get("t")
+    if kind == "inlineStr":
+        node = c.find(f"{_XLSX_MAIN}is")
+        return _xlsx_text(node) if node is not None else ""
+    v = c.findtext(f"{_XLSX_MAIN}v")
+    if v is None:
         return ""
-    return {
-        "company":      g("Company"),
-        "team":         g("Team"),
-        "experience":   g("Experience", "Role", "Project"),
-        "advisors":     g("Advisors", "Advisor"),
-        "description":  g("Description", "Bullets"),
-        "position":     g("Position", "Title"),
-        "company_date": g("Company Date", "Date"),
-        "tag":          g("tag","Tag"),
-        # NEW link fields
-        "paper_link":   g("Paper Link", "Paper", "Paper URL"),
-        "code_link":    g("Code Link", "Code", "Code URL", "Github", "GitHub"),
-        "website_link": g("Project Website", "Website", "Project URL"),
-        "video_link":   g("Video Link", "Video", "Demo Video"),
-        "image_link":   g("Image Link", "Image", "Demo Image"),
-    }
+    if kind == "s":
+        return shared[int(v)]
+    if kind == "b":
+        return "TRUE" if v == "1" else "FALSE"
+    if kind in ("str", "e"):
+        return v
+    try:  # numbers: render 2024.0 as 2024, like the CSV export does
+        f = float(v)
+        return str(int(f)) if f.is_integer() else v
+    except ValueError:
+        return v
+
+def _xlsx_plain_styles(z, names):
+    """Indices of the cell styles whose number format is General or Text, or
+    None if the workbook has no styles (every cell is General)."""
+    if "xl/styles.xml" not in names:
+        return None
+    xfs = ET.fromstring(z.read("xl/styles.xml")).find(f"{_XLSX_MAIN}cellXfs")
+    if xfs is None:
+        return None
+    return {i for i, xf in enumerate(xfs.findall(f"{_XLSX_MAIN}xf")) if xf.get("numFmtId", "0") in ("0", "49")}
+
+def _xlsx_grid(root, shared, plain):
+    """A sheet's rows as lists of strings, or None if a number in it has a
+    number format, which the CSV export applies and this reader does not."""
+    grid = []
+    for row in root.iter(f"{_XLSX_MAIN}row"):
+        # rows without cells are left out of the file; the CSV export keeps
+        # them as blank lines (",,,"), so pad from the 1-based index as well
+        if row.get("r"):
+            grid.extend([] for _ in range(int(row.get("r")) - 1 - len(grid)))
+        cells, col = [], 0
+        for c in row.iter(f"{_XLSX_MAIN}c"):
+            if (plain is not None and c.get("t", "n") in ("n", "d") and c.find(f"{_XLSX_MAIN}v") is not None
+                    and int(c.get("s", 0)) not in plain):
+                return None
+            ref = c.get("r")
+            if ref:
+                col = _xlsx_col(ref)
+            cells.extend([""] * (col - len(cells)))
+            cells.append(_xlsx_value(c, shared))
+            col += 1
+        grid.append(cells)
+    return grid
+
+def read_workbook(data:bytes):
+    """Split an .xlsx workbook into {sheet title: Table}, every value a
+    string. A sheet with number-formatted cells maps to None instead: its
+    values would differ from the CSV export's."""
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        names = set(z.namelist())
+        shared = []
+        if "xl/sharedStrings.xml" in names:
+            root = ET.fromstring(z.read("xl/sharedStrings.xml"))
+            shared = [_xlsx_text(si) for si in root.iter(f"{_XLSX_MAIN}si")]
+        plain = _xlsx_plain_styles(z, names)
+        rels = {}
+        for rel in ET.fromstring(z.read("xl/_rels/workbook.xml.rels")).iter(f"{_PKG_REL}Relationship"):
+            target = rel.get("Target", "")
+            rels[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+        out = {}
+        for sheet in ET.fromstring(z.read("xl/workbook.xml")).iter(f"{_XLSX_MAIN}sheet"):
+            path = rels.get(sheet.get(f"{_XLSX_REL}id"))
+            if path not in names:
+                continue
+            grid = _xlsx_grid(ET.fromstring(z.read(path)), shared, plain)
+            if grid is None:
+                out[sheet.get("name")] = None
+                continue
+            if not grid:
+                out[sheet.get("name")] = Table((), [])
+                continue
+            header, width = grid[0], max(len(r) for r in grid)
+            header = header + [""] * (width - len(header))
+            out[sheet.get("name")] = Table(header, [tuple(r + [""] * (width - len(r))) for r in grid[1:]])
+        return out
+
+def fetch_workbook(url:str=None, use_cache=None):
+    """{sheet title: rows} for the whole workbook; url may be a local path."""
+    url = url or WORKBOOK_URL
+    if not url.startswith(("http://", "https://")):
+        path = url[len("file://"):] if url.startswith("file://") else url
+        return read_workbook(Path(path).read_bytes())
+    return fetch_rows(url, use_cache=use_cache, parse=read_workbook)
+
+# the publish page lists each sheet as a tab button and in its script
+_SHEET_BUTTON_RE = re.compile(r'id="sheet-button-(\d+)"[^>]*>\s*<a[^>]*>(.*?)</a>', re.S)
+_SHEET_ITEM_RE   = re.compile(r'items\.push\(\{name: "((?:[^"\\]|\\.)*)",[^}]*?gid: "(\d+)"')
+_JS_ESCAPE_RE    = re.compile(r"\\(?:x([0-9a-fA-F]{2})|u([0-9a-fA-F]{4})|(.))")
+
+def read_sheet_index(data:bytes):
+    """{gid: sheet title} from the spreadsheet's publish page (pubhtml)."""
+    page = data.decode("utf-8", "replace")
+    index = {gid: unescape(re.sub(r"<[^>]+>", "", title)).strip() for gid, title in _SHEET_BUTTON_RE.findall(page)}
+    for name, gid in _SHEET_ITEM_RE.findall(page):
+        index.setdefault(gid, _JS_ESCAPE_RE.sub(lambda m: chr(int(m.group(1) or m.group(2), 16))
+                                                if m.group(3) is None else m.group(3), name))
+    return index
+
+def _gid(url:str):
+    return parse_qs(urlsplit(url).query).get("gid", [None])[0]
+
+def fetch_tabs(urls, mode=None, use_cache=None):
+    """{url: rows} for the given tabs, either one request per tab ("csv") or
+    one workbook download split locally ("workbook")."""
+    mode = mode or INGEST_MODE
+    urls = list(dict.fromkeys(u for u in urls if u and not u.startswith("PASTE_")))
+    if not urls:
+        return {}
+    if mode != "workbook":
+        return fetch_all(urls, use_cache=use_cache)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        book = pool.submit(fetch_workbook, use_cache=use_cache)
+        index = pool.submit(fetch_rows, WORKBOOK_INDEX_URL, use_cache=use_cache, parse=read_sheet_index)
+        try:
+            sheets, titles = book.result(), index.result()
+        except (requests.RequestException, OSError, KeyError, zipfile.BadZipFile, ET.ParseError) as error:
+            print(f"WARNING: workbook download failed ({error}); falling back to per-tab CSV.")
+            sheets, titles = {}, {}
+    tabs = {u: sheets[titles[_gid(u)]] for u in urls if sheets.get(titles.get(_gid(u))) is not None}
+    missing = [u for u in urls if u not in tabs]
+    if missing and sheets:
+        unknown = [_tab_label(u) for u in missing if titles.get(_gid(u)) not in sheets]
+        formatted = [_tab_label(u) for u in missing if titles.get(_gid(u)) in sheets]
+        if unknown:
+            print(f"WARNING: no sheet with the gid of {', '.join(unknown)} in the workbook "
+                  f"(publish page lists {len(titles)} sheet(s)); fetching them as CSV.")
+        if formatted:
+            print(f"Fetching {', '.join(formatted)} as CSV: number-formatted cells.")
+    tabs.update(fetch_all(missing, use_cache=use_cache))
+    return {u: tabs[u] for u in urls}
+
+# --- records: header -> field mapping resolved once per tab ---
+class MissingColumnsError(ValueError):
+    """A tab lacks a column its section cannot be built without."""
+
+class Schema:
+    """The fields a section reads from one tab: (field, header aliases in
+    priority order, required). compile() resolves them against a header once,
+    giving a function (cached per header) that turns a row tuple into a
+    namedtuple record with every value stripped; records() does the same for
+    many rows. With first_nonempty, a field takes the first alias column that
+    is non-empty in that row; otherwise the first alias present in the header
+    wins. `clean` maps fields to an extra per-value function."""
+    def __init__(self, tab, fields, first_nonempty=False, clean=None):
+        self.tab = tab
+        self.fields = fields
+        self.first_nonempty = first_nonempty
+        self.clean = clean or {}
+        self.record = namedtuple(tab.replace(" ", "") + "Record", [f[0] for f in fields])
+        self._compiled = {}
+        self._projections = {}
+
+    def project(self, *names):
+        """The same tab read for just these fields (cached), e.g. the tag
+        column alone for indexing without building whole records."""
+        sub = self._projections.get(names)
+        if sub is None:
+            fields = [f for f in self.fields if f[0] in names]
+            sub = self._projections[names] = Schema(self.tab, fields, self.first_nonempty,
+                                                    {k: v for k, v in self.clean.items() if k in names})
+        return sub
+
+    def compile(self, header, label=None):
+        return self._resolve(header, label)[0]
+
+    def records(self, header, rows, label=None):
+        """Records for the rows of a tab with this header (lazy)."""
+        return self._resolve(header, label)[1](rows)
+
+    def _resolve(self, header, label):
+        converters = self._compiled.get(header)
+        if converters is None:
+            converters = self._compiled[header] = self._compile(header, label or self.tab)
+        return converters
+
+    def _compile(self, header, label):
+        index = {}
+        for i, col in enumerate(header):
+            index[col] = i  # a repeated column name keeps its last cell, as csv.DictReader does
+        cols, missing = [], []
+        for name, aliases, required in self.fields:
+            present = [index[a] for a in aliases if a in index]
+            if required and not present:
+                missing.append(" / ".join(repr(a) for a in aliases))
+            cols.append(present if self.first_nonempty else present[:1])
+        if missing:
+            found = ", ".join(repr(c) for c in header if c) or "none"
+            raise MissingColumnsError(
+                f"{label} tab is missing required column(s) {'; '.join(missing)} (found: {found})")
+
+        # Each field reads one cell through a single itemgetter (a field with
+        # no column reads cell 0 and is blanked below). Fields with several
+        # alias columns or a clean function are fixed up after the strip.
+        first = [c[0] if c else 0 for c in cols]
+        get = itemgetter(*first) if len(first) > 1 else (lambda row, i=first[0]: (row[i],))
+        fixes = [(pos, tuple(c), self.clean.get(name))
+                 for pos, ((name, _, _), c) in enumerate(zip(self.fields, cols))
+                 if len(c) != 1 or name in self.clean]
+        new, record, strip = tuple.__new__, self.record, str.strip
+        if not fixes:
+            def convert(row):
+                return new(record, map(strip, get(row)))
+            def convert_rows(rows):  # the same, without a Python call per row
+                return map(new, repeat(record), map(map, repeat(strip), map(get, rows)))
+            return convert, convert_rows
+
+        def convert(row):
+            values = list(map(strip, get(row)))
+            for pos, c, clean in fixes:
+                if len(c) != 1:
+                    values[pos] = next((row[i] for i in c if row[i]), "").strip()
+                if clean:
+                    values[pos] = clean(values[pos])
+            return new(record, values)
+        return convert, partial(map, convert)
+
+def iter_records(schema:Schema, rows, label=None):
+    """Records for a tab given as a Table or as the header followed by row
+    tuples (a stream). A missing required column raises MissingColumnsError
+    before any row is read; a blank tab yields nothing."""
+    it = iter(rows)
+    header = next(it, None)
+    if not header:
+        return
+    yield from schema.records(tuple(header), it, label)
 
-def _format_exp_links(r: dict) -> str:
+PUB_SCHEMA = Schema("Publications", [
+    ("title",   ("title", "Title"),          True),
+    ("authors", ("authors", "Authors"),      False),
+    ("venue",   ("venue", "Venue"),          False),
+    ("link",    ("link", "URL", "Link"),     False),
+    ("tag",     ("tag", "Tag"),              True),
+], first_nonempty=True)
+
+ACH_SCHEMA = Schema("Achievements", [
+    ("latex_update", ("latex update", "latex_update", "Latex update", "Latex Update"), True),
+    ("tag",          ("tag", "Tag"), True),
+])
+
+EDU_SCHEMA = Schema("Education", [
+    ("institution",  ("Institution",),  True),
+    ("program",      ("Program",),      False),
+    ("affiliations", ("Affiliations",), False),
+    ("courses",      ("Courses",),      False),
+    ("dates",        ("Dates",),        False),
+    ("location",     ("Location",),     False),
+])
+
+def _join_lines(text):
+    """A stripped cell with every whitespace run that contains a newline
+    turned into one space; splitting on newlines is several times faster
+    than the equivalent regex substitution."""
+    if "\n" not in text:
+        return text
+    return " ".join(filter(None, map(str.strip, text.split("\n"))))
+
+RESEARCH_SCHEMA = Schema("Research Interest", [
+    ("text", ("Research Interest", "Research Interests", "research interest", "research interests"), True),
+    ("tag",  ("tag", "Tag"), True),
+], first_nonempty=True, clean={"text": _join_lines})
+
+EXPERIENCE_SCHEMA = Schema("Experience", [
+    ("company",      ("Company",),                    True),
+    ("team",         ("Team",),                       False),
+    ("experience",   ("Experience", "Role", "Project"), False),
+    ("advisors",     ("Advisors", "Advisor"),         False),
+    ("description",  ("Description", "Bullets"),      False),
+    ("position",     ("Position", "Title"),           False),
+    ("company_date", ("Company Date", "Date"),        False),
+    ("tag",          ("tag", "Tag"),                  True),
+    ("paper_link",   ("Paper Link", "Paper", "Paper URL"), False),
+    ("code_link",    ("Code Link", "Code", "Code URL", "Github", "GitHub"), False),
+    ("website_link", ("Project Website", "Website", "Project URL"), False),
+    ("video_link",   ("Video Link", "Video", "Demo Video"), False),
+    ("image_link",   ("Image Link", "Image", "Demo Image"), False),
+])
+
+# --- tag index: tag -> rows, across the tagged tabs ---
+def tagged_tabs():
+    """{url: (schema, label)} for the configured tabs that have a tag column."""
+    tabs = {PUBS_CSV: (PUB_SCHEMA, None), PATENTS_CSV: (PUB_SCHEMA, "Patents")}
+    for url, schema in ((ACHIEVEMENTS_CSV, ACH_SCHEMA), (RESEARCH_CSV, RESEARCH_SCHEMA),
+                        (EXPERIENCE_CSV, EXPERIENCE_SCHEMA)):
+        if not url.startswith("PASTE_"):
+            tabs[url] = (schema, None)
+    return tabs
+
+class TagIndex:
+    """Inverted index over fetched tabs: for each tag, the positions of the
+    rows carrying it, per tab. A tab's tag column is read the first time a
+    query touches it and query results are kept, so several variants built
+    from one fetch share the work. Only Tables are indexed; a streamed tab is
+    filtered row by row as it arrives (still one parse per distinct cell)."""
+
+    def __init__(self, tabs):
+        self.tabs = dict(tabs)
+        self._postings = {}   # url -> {tag: [row position]}
+        self._results = {}    # (url, query) -> [row position]
+
+    def postings(self, url):
+        if url not in self._postings:
+            schema, label = tagged_tabs()[url]
+            table = self.tabs[url]
+            index = defaultdict(list)
+            if table.header:
+                tag_of = schema.project("tag").compile(table.header, label)
+                for i, row in enumerate(table.rows):
+                    for t in parse_tags(tag_of(row)[0]):
+                        index[t].append(i)
+            self._postings[url] = dict(index)
+        return self._postings[url]
+
+    def positions(self, url, query:TagQuery):
+        """Sorted positions of the matching rows of one (Table) tab."""
+        key = (url, query)
+        if key not in self._results:
+            index = self.postings(url)
+            hits = None
+            if len(query.any_of) == 1 and not query.all_of and not query.exclude:
+                hits = index.get(next(iter(query.any_of)), [])
+            else:
+                if query.any_of:
+                    hits = set().union(*(index.get(t, ()) for t in query.any_of))
+                for t in query.all_of:
+                    hits = set(index.get(t, ())) if hits is None else hits.intersection(index.get(t, ()))
+                if hits is None:
+                    hits = set(range(len(self.tabs[url])))
+                hits = sorted(hits.difference(*(index.get(t, ()) for t in query.exclude)))
+            self._results[key] = hits
+        return self._results[key]
+
+    def select(self, url, query=None):
+        """Records of one tagged tab matching the query, in sheet order (lazy)."""
+        query = as_tag_query(query)
+        schema, label = tagged_tabs()[url]
+        rows = self.tabs[url]
+        if not isinstance(rows, Table):
+            for r in iter_records(schema, rows, label):
+                if tags_match(query, parse_tags(r.tag)):
+                    yield r
+            return
+        if not rows.header:
+            return
+        convert, table = schema.compile(rows.header, label), rows.rows
+        for i in self.positions(url, query):
+            yield convert(table[i])
+
+    def tags(self):
+        """{tag: number of rows carrying it} over every tagged (Table) tab."""
+        counts = defaultdict(int)
+        for url in tagged_tabs():
+            if isinstance(self.tabs.get(url), Table):
+                for t, hits in self.postings(url).items():
+                    counts[t] += len(hits)
+        return dict(counts)
+
+_INDEX = None
+
+def tag_index(tabs)->TagIndex:
+    """The TagIndex for these fetched tabs; reused while every tab is the same
+    object (watch mode replaces a tab when it changes, which rebuilds it)."""
+    global _INDEX
+    if (_INDEX is None or _INDEX.tabs.keys() != tabs.keys()
+            or any(_INDEX.tabs[u] is not rows for u, rows in tabs.items())):
+        _INDEX = TagIndex(tabs)
+    return _INDEX
+
+def _format_exp_links(r) -> str:
     """Builds space-separated [paper] [code] [website] [video] hyperlinks if present."""
     links = []
-    if r.get("paper_link"):
-        links.append(rf"\href{{{esc_edu(r['paper_link'])}}}{{[Paper]}}")
-    if r.get("code_link"):
-        links.append(rf"\href{{{esc_edu(r['code_link'])}}}{{[Code]}}")
-    if r.get("website_link"):
-        links.append(rf"\href{{{esc_edu(r['website_link'])}}}{{[Website]}}")
-    if r.get("video_link"):
-        links.append(rf"\href{{{esc_edu(r['video_link'])}}}{{[Video]}}")
-    if r.get("image_link"):
-        links.append(rf"\href{{{esc_edu(r['image_link'])}}}{{[Image]}}")
+    if r.paper_link:
+        links.append(rf"\href{{{esc_url(r.paper_link)}}}{{[Paper]}}")
+    if r.code_link:
+        links.append(rf"\href{{{esc_url(r.code_link)}}}{{[Code]}}")
+    if r.website_link:
+        links.append(rf"\href{{{esc_url(r.website_link)}}}{{[Website]}}")
+    if r.video_link:
+        links.append(rf"\href{{{esc_url(r.video_link)}}}{{[Video]}}")
+    if r.image_link:
+        links.append(rf"\href{{{esc_url(r.image_link)}}}{{[Image]}}")
     return " ".join(links)
 
 
 # --- builders (existing) ---
 def make_pub_item(r):
-    title   = esc_plain(r["title"])
-    authors = bold_name(esc_plain(r["authors"]))
-    venue   = esc_plain(r["venue"])
-    link    = r["link"]
+    title   = esc_plain(r.title)
+    authors = bold_name(esc_plain(r.authors))
+    venue   = esc_plain(r.venue)
+    link    = esc_url(r.link)
     linkpart = (f" \\quad \\href{{{link}}}{{[link]}}" if (INCLUDE_LINK and link) else "")
     return (
 f"""    \\item \\textbf{{{title}}} \\\\
@@ -149,8 +898,11 @@ f"""    \\item \\textbf{{{title}}} \\\\
         {{\\\\ \\textit{{{venue}}}}}{linkpart}\\"""
     )
 
-def build_publications_tex(pubs, pats):
-    lines = [
+# Each section has an iter_*_tex generator yielding lines (joined with "\n"),
+# so rows can be streamed from the sheet straight into the output file, and a
+# build_*_tex wrapper returning the whole text.
+def iter_publications_tex(pubs, pats):
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\vspace{5pt}",
         r"\noindent {\large \bf PUBLICATIONS \& PATENTS} \\ [-5pt]",
@@ -159,13 +911,15 @@ def build_publications_tex(pubs, pats):
         r"\begin{itemize}[leftmargin=2.5em,labelsep=1em]",
         # r"    \itemsep-0.3em",
     ]
-    for r in pubs: lines.append(make_pub_item(r))
-    for r in pats: lines.append(make_pub_item(r))
-    lines += [r"\end{itemize}", ""]
-    return "\n".join(lines)
+    for r in pubs: yield make_pub_item(r)
+    for r in pats: yield make_pub_item(r)
+    yield from [r"\end{itemize}", ""]
 
-def build_achievements_tex(items):
-    lines = [
+def build_publications_tex(pubs, pats):
+    return "\n".join(iter_publications_tex(pubs, pats))
+
+def iter_achievements_tex(items):
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\vspace{5pt}",
         r"\noindent {\large \bf AWARDS \& HONORS} \\[-5pt]",
@@ -176,9 +930,11 @@ def build_achievements_tex(items):
         # r"    \itemsep-0.3em",
     ]
     for txt in items:
-        lines.append(f"    \\item {esc_edu(txt)}")
-    lines += [r"\end{itemize}", ""]
-    return "\n".join(lines)
+        yield f"    \\item {esc_edu(txt)}"
+    yield from [r"\end{itemize}", ""]
+
+def build_achievements_tex(items):
+    return "\n".join(iter_achievements_tex(items))
 
 def split_program_lines(program:str)->str:
     if ";" in program:
@@ -186,32 +942,34 @@ def split_program_lines(program:str)->str:
         return esc_edu(first.strip()) + r"\\ " + esc_edu(rest.strip())
     return esc_edu(program)
 
-def build_education_tex(rows):
-    lines = [
+def iter_education_tex(rows):
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\noindent {\large \bf EDUCATION} \\[-5pt]",
         r"\rule{\textwidth}{1.5pt}\\",
         r"\vspace{-5pt}\\",
     ]
     for r in rows:
-        inst  = esc_edu(r["Institution"])
-        loc   = esc_edu(r["Location"])
-        dates = esc_edu(r["Dates"])
-        prog  = split_program_lines(r["Program"])
-        aff   = esc_edu(r["Affiliations"])
-        crs   = esc_edu(r["Courses"])
-        lines.append(
+        inst  = esc_edu(r.institution)
+        loc   = esc_edu(r.location)
+        dates = esc_edu(r.dates)
+        prog  = split_program_lines(r.program)
+        aff   = esc_edu(r.affiliations)
+        crs   = esc_edu(r.courses)
+        yield (
                     f"""{{\\bf {inst}}}{{  \\hfill \\textit{{{loc}}} \\\\\\
                           \\small{{{prog}\\hfill \\textit{{{dates}}} \\\\\\
                           {aff}""" + (f""" \\\\
                           \\textbf{{Relevant coursework}}: {crs}""" if crs else "") + """}}
                     """
         )
-        lines.append(r"\vspace{5pt}")
-    return "\n".join(lines)
+        yield r"\vspace{5pt}"
 
-def build_research_tex(paragraphs):
-    lines = [
+def build_education_tex(rows):
+    return "\n".join(iter_education_tex(rows))
+
+def iter_research_tex(paragraphs, medskip_after=False):
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\noindent {\large \bf RESEARCH INTERESTS} \\[-5pt]",
         r"\rule{\textwidth}{1.5pt}\\",
@@ -220,10 +978,14 @@ def build_research_tex(paragraphs):
     ]
     for i, para in enumerate(paragraphs):
         if i > 0:
-            lines.append(r"\par\medskip")
-        lines.append(esc_edu(para))
-    lines.append("")
-    return "\n".join(lines)
+            yield r"\par\medskip"
+        yield esc_edu(para)
+    if medskip_after:
+        yield r"\par\medskip"
+    yield ""
+
+def build_research_tex(paragraphs):
+    return "\n".join(iter_research_tex(paragraphs))
 
 def _desc_to_itemize(desc_raw: str) -> str:
     """Zero-vertical-space itemize; accepts '\item ...' or plain/semicolon text."""
@@ -250,14 +1012,14 @@ def _desc_to_itemize(desc_raw: str) -> str:
     )
 
 
-def build_experience_tex(rows):
+def iter_experience_tex(rows, keep=tag_has_resume):
     """
     Exact sheet order; zero spacing within a company block.
     Heading:  {Company}, \textit{Position} \hfill \textit{CompanyDate}\\
     Subline:  \textit{Experience} --- Team [paper] [code] [website] [video] \hfill Advisors\\
     Bullets:  compact itemize produced by _desc_to_itemize()
     """
-    out = [
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\vspace{5pt}",
         r"\noindent {\large \bf EXPERIENCE} \\[-5pt]",
@@ -270,12 +1032,12 @@ def build_experience_tex(rows):
     first_block = True
 
     for r in rows:
-        if not tag_has_resume(r.get("tag", "")):
+        if keep is not None and not keep(r.tag):  # None: rows are already selected
             continue
 
-        comp_raw = r.get("company", "")
-        pos_raw  = r.get("position", "")
-        dt_raw   = r.get("company_date", "")
+        comp_raw = r.company
+        pos_raw  = r.position
+        dt_raw   = r.company_date
         key = (comp_raw, pos_raw, dt_raw)
 
         comp = esc_edu(comp_raw)
@@ -285,18 +1047,18 @@ def build_experience_tex(rows):
         # New (company, position, date) heading
         if key != current_key:
             # if not first_block:
-            #     out.append(r"\vspace{10pt}")  # spacing between companies, if desired
+            #     yield r"\vspace{10pt}"  # spacing between companies, if desired
             left  = f"{{\\bf {comp}}}" + (f", \\textit{{{pos}}}" if pos else "")
             right = f" \\hfill \\textit{{{dt}}}" if dt else ""
-            out.append(left + right + r"\\")
-            # out.append(r"\vspace{30pt}")  # tighten space after heading
+            yield left + right + r"\\"
+            # yield r"\vspace{30pt}"  # tighten space after heading
             current_key = key
             first_block = False
 
         # Subheading line: Experience --- Team + optional links, advisors on right
-        exp  = esc_edu(r.get("experience", ""))
-        team = esc_edu(r.get("team", ""))
-        adv  = esc_edu(r.get("advisors", ""))
+        exp  = esc_edu(r.experience)
+        team = esc_edu(r.team)
+        adv  = esc_edu(r.advisors)
 
         # left_core = rf"\textit{{{exp}}}" if not team else rf"\textit{{{exp}}} --- {team}"
         left_indent = r"\hspace*{0.8em}"  # tweak amount to taste
@@ -311,44 +1073,49 @@ def build_experience_tex(rows):
             left_core = f"{left_core} {links_str}"
 
         if left_core.strip():
-            out.append(left_core + (f" \\hfill {adv}" if adv else "") + r"\\")
+            yield left_core + (f" \\hfill {adv}" if adv else "") + r"\\"
 
         # Bullets (already compact/indented via _desc_to_itemize)
-        dblock = _desc_to_itemize(r.get("description", ""))
+        dblock = _desc_to_itemize(r.description)
         if dblock:
-            out.append(dblock)
-            out.append(r"\vspace{7pt}")  # uncomment if you want space after each entry
+            yield dblock
+            yield r"\vspace{7pt}"  # uncomment if you want space after each entry
 
-    # out.append("}")   # end local spacing group
-    out.append("")    # trailing newline
-    return "\n".join(out)
+    # yield "}"   # end local spacing group
+    yield ""    # trailing newline
 
-def build_skills_tex(rows):
+def build_experience_tex(rows):
+    return "\n".join(iter_experience_tex(rows))
+
+def iter_skills_tex(rows):
     """
-    Input: rows from the Skills tab where columns are categories (Libraries, Coding, ...)
-           and each column has items down the rows (cells can be blank).
+    Input: the Skills tab (a Table, or the header followed by row tuples) where
+           columns are categories (Libraries, Coding, ...) and each column has
+           items down the rows (cells can be blank).
     Output: a compact SKILLS section with one line per category.
+    Rows are consumed in a single pass, so they may come from a stream.
     """
-    if not rows:
-        return "% No skills rows"
-
-    # preserve column order exactly as in the sheet
-    columns = list(rows[0].keys())
-
-    # collect non-empty cells per column (skip completely empty column names if any)
-    col_to_items = []
-    for col in columns:
-        if not (col or "").strip():
-            continue
-        items = []
-        for r in rows:
-            cell = (r.get(col) or "").strip()
+    # collect non-empty cells per column, preserving the sheet's column order
+    # (skip completely empty column names if any)
+    it = iter(rows)
+    header = next(it, ())
+    index = {}
+    for i, col in enumerate(header):
+        index[col] = i  # a repeated column name keeps its last cell, as csv.DictReader does
+    col_to_items = None
+    for r in it:
+        if col_to_items is None:
+            col_to_items = {col: [] for col in index if (col or "").strip()}
+            columns = [(index[col], items) for col, items in col_to_items.items()]
+        for i, items in columns:
+            cell = r[i].strip()
             if cell:
                 items.append(esc_edu(cell))
-        # keep the category even if empty, but usually there are items
-        col_to_items.append((esc_edu(col), items))
+    if col_to_items is None:
+        yield "% No skills rows"
+        return
 
-    lines = [
+    yield from [
         r"% AUTO-GENERATED — do not edit manually",
         r"\vspace{5pt}",
         r"\noindent {\large \bf SKILLS} \\[-5pt]",
@@ -356,72 +1123,509 @@ def build_skills_tex(rows):
         r"\vspace{-6pt}",
         "",
     ]
-    lines.append(r"\begin{itemize}[leftmargin=0.5em,labelsep=1em,label={}]")
-    for (cat, items) in col_to_items:
+    yield r"\begin{itemize}[leftmargin=0.5em,labelsep=1em,label={}]"
+    for col, items in col_to_items.items():
+        # keep the category even if empty, but usually there are items
+        cat = esc_edu(col)
         if not cat:
             continue
         joined = ", ".join(items)
         # one tight line per category
-        lines.append(rf"\item \textbf{{{cat}}}: {joined}")
-    lines.append(r"\end{itemize}")
-    return "\n".join(lines)
+        yield rf"\item \textbf{{{cat}}}: {joined}"
+    yield r"\end{itemize}"
 
+def build_skills_tex(rows):
+    return "\n".join(iter_skills_tex(rows))
 
-# --- main ---
-def main():
-    # pubs + patents
-    pubs_all = [norm_pub_row(r) for r in fetch_rows(PUBS_CSV)]
-    pats_all = [norm_pub_row(r) for r in fetch_rows(PATENTS_CSV)]
-    pubs = [r for r in pubs_all if tag_has_resume(r["tag"])]
-    pats = [r for r in pats_all if tag_has_resume(r["tag"])]
+
+# --- output: content-hash compare + atomic replace ---
+def _sha256_file(path:Path):
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+def write_if_changed(path:Path, text:str)->bool:
+    """Write text to path only if its content differs from what is on disk.
+    Unchanged files keep their mtime (so latexmk sees nothing new); changed
+    files are written to a temp file and renamed into place. Returns True if
+    the file was (re)written."""
+    return write_bytes_if_changed(path, text.encode("utf-8"))
+
+def write_bytes_if_changed(path:Path, data:bytes)->bool:
+    if _sha256_file(path) == hashlib.sha256(data).hexdigest():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return True
+
+def write_lines_if_changed(path:Path, lines)->bool:
+    """Like write_if_changed, but streams lines (joined with "\n") into the
+    temp file while hashing them, so the section is never held in memory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    h = hashlib.sha256()
+    try:
+        with open(tmp, "wb") as f:
+            sep = b""
+            for line in lines:
+                data = sep + line.encode("utf-8")
+                f.write(data)
+                h.update(data)
+                sep = b"\n"
+        if _sha256_file(path) == h.hexdigest():
+            return False
+        os.replace(tmp, path)
+        return True
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+# Exit status with --exit-unchanged when every section was already up to date,
+# for callers that skip the LaTeX stage on it. Off by default: a no-op build
+# is a success, and `set -e` scripts and CI must see 0.
+EXIT_UNCHANGED = 3
+# Exit status when a tab lacks a column its section needs (MissingColumnsError).
+EXIT_BAD_SHEET = 4
+# Exit status with --check-links fail when a link in the resume is dead.
+EXIT_DEAD_LINKS = 5
+
+# --- section registry ---
+# One SectionSpec per output file: the tabs it reads (`urls`), the Schema that
+# normalizes their rows into records (None: rows go to `build` as they are),
+# whether rows are filtered by the tag selection, and the builder taking one
+# record iterator per tab and yielding lines. Sections are named for
+# --only/--skip; their file stem (e.g. "achievments") works as well.
+SectionSpec = namedtuple("SectionSpec", "path urls schema tagged build")
+
+def _pubs_then_patents(pubs, pats):
     if MERGE_MODE == "pubs_then_patents":
-        pubs_out, pats_out = pubs, pats
+        return iter_publications_tex(pubs, pats)
+    return iter_publications_tex(pats, pubs)
+
+def sections():
+    """{name: SectionSpec} for every section, in output order (built on each
+    call, like tagged_tabs(), so reassigned *_CSV constants are picked up)."""
+    return {
+        "publications": SectionSpec(PUBS_TEX, (PUBS_CSV, PATENTS_CSV), PUB_SCHEMA, True, _pubs_then_patents),
+        "achievements": SectionSpec(ACHV_TEX, (ACHIEVEMENTS_CSV,), ACH_SCHEMA, True,
+                                    lambda rows: iter_achievements_tex(r.latex_update for r in rows if r.latex_update)),
+        "education":    SectionSpec(EDU_TEX, (EDUCATION_CSV,), EDU_SCHEMA, False, iter_education_tex),
+        "research":     SectionSpec(RES_TEX, (RESEARCH_CSV,), RESEARCH_SCHEMA, True,
+                                    lambda rows: iter_research_tex((r.text for r in rows if r.text), medskip_after=True)),
+        "experience":   SectionSpec(EXP_TEX, (EXPERIENCE_CSV,), EXPERIENCE_SCHEMA, True,
+                                    lambda rows: iter_experience_tex(rows, keep=None)),
+        "skills":       SectionSpec(SKL_TEX, (SKILLS_CSV,), None, False, iter_skills_tex),
+    }
+
+def select_sections(only=None, skip=None):
+    """{name: SectionSpec} of the configured sections (no PASTE_ tab), limited
+    to the names in `only` and without those in `skip`. Raises ValueError for
+    a name that is not a section."""
+    specs = sections()
+    def resolve(names):
+        by_name = {p: name for name, spec in specs.items() for p in (name, spec.path.stem)}
+        unknown = sorted(n for n in names if n not in by_name)
+        if unknown:
+            raise ValueError(f"unknown section(s) {', '.join(unknown)}; expected one of {', '.join(specs)}")
+        return {by_name[n] for n in names}
+    wanted = resolve(only) if only is not None else set(specs)
+    wanted -= resolve(skip or ())
+    return {name: spec for name, spec in specs.items()
+            if name in wanted and not any(u.startswith("PASTE_") for u in spec.urls)}
+
+def section_lines(tabs, tags=None, only=None):
+    """{output path: iterator of lines} for the configured sections (or just
+    the paths in `only`), given {url: rows} holding at least their tabs.
+    Everything is lazy: rows are selected, normalized and turned into lines
+    only as the output is consumed, so streamed tabs are never held in
+    memory. Tagged rows are selected through tag_index() by `tags`: None for
+    RESUME_QUERY, a TagQuery, or a list meaning any of those tags."""
+    index = tag_index(tabs)
+    query = as_tag_query(tags)
+    out = {}
+    for spec in select_sections().values():
+        if only is not None and spec.path not in only:
+            continue  # its tabs may not even be fetched
+        if spec.tagged:
+            streams = [index.select(u, query) for u in spec.urls]
+        elif spec.schema is not None:
+            streams = [iter_records(spec.schema, tabs[u]) for u in spec.urls]
+        else:
+            streams = [tabs[u] for u in spec.urls]
+        out[spec.path] = spec.build(*streams)
+    return out
+
+def tab_urls(specs=None):
+    """The tabs the given sections (default: all) are built from, in order."""
+    specs = sections() if specs is None else specs
+    return list(dict.fromkeys(u for spec in specs.values() for u in spec.urls))
+
+def section_tabs():
+    """{output path: tab URLs it is built from}, for incremental rebuilds."""
+    return {spec.path: spec.urls for spec in sections().values()}
+
+def check_columns(tabs):
+    """Raise MissingColumnsError for any fetched Table lacking a required
+    column, before a single section is written. (Streamed tabs can only be
+    checked once their header arrives.)"""
+    labels = tagged_tabs()
+    for spec in sections().values():
+        for url in spec.urls:
+            table = tabs.get(url)
+            if spec.schema is not None and isinstance(table, Table) and table.header:
+                spec.schema.compile(table.header, labels[url][1] if url in labels else None)
+
+def write_sections(tabs, only=None, tags=None, out_dir=None):
+    """Write every section (or just the paths in `only`) whose content changed,
+    optionally with another tag selection and under another root directory.
+    Returns the paths that were rewritten."""
+    check_columns(tabs)
+    changed = []
+    for path, lines in section_lines(tabs, tags, only).items():
+        if out_dir is not None:
+            path = Path(out_dir) / path
+        # lazy builders run while the file is written, so this span is
+        # normalize + build + write for the section (and the fetch with --stream)
+        with tracing.span(f"section {path.stem}", "section", path=str(path)) as sp:
+            wrote = write_lines_if_changed(path, tracing.counted(lines, sp, "lines"))
+            sp.set(bytes=path.stat().st_size if tracing.enabled() else 0, changed=wrote)
+        if wrote:
+            changed.append(path)
+            print(f"Wrote {path}.")
+        else:
+            print(f"Unchanged {path}.")
+    return changed
+
+def build_sections(tabs):
+    """Render all configured sections from fetched tabs ({url: rows}).
+    Returns {output path: tex} in a fixed order."""
+    return {path: "\n".join(lines) for path, lines in section_lines(tabs).items()}
+
+
+# --- links (checked by check_links.py) ---
+_EXP_LINKS = (("paper_link", "Paper"), ("code_link", "Code"), ("website_link", "Website"),
+              ("video_link", "Video"), ("image_link", "Image"))
+
+def link_tabs():
+    """The tab URLs whose rows carry \\href targets."""
+    return [u for u in (PUBS_CSV, PATENTS_CSV, EXPERIENCE_CSV) if not u.startswith("PASTE_")]
+
+def collect_links(tabs, tags=None):
+    """{url: [where it appears]} for every http(s) link the sections emit
+    (make_pub_item, _format_exp_links), over the rows `tags` selects from
+    whichever of link_tabs() were fetched."""
+    index = tag_index(tabs)
+    query = as_tag_query(tags)
+    links = {}
+    def add(url, where):
+        if urlsplit(url).scheme in ("http", "https"):
+            links.setdefault(url, []).append(where)
+    if INCLUDE_LINK:
+        for url in (PUBS_CSV, PATENTS_CSV):
+            if url not in tabs:
+                continue
+            label = tagged_tabs()[url][1] or "Publications"
+            for r in index.select(url, query):
+                if r.link:
+                    add(r.link, f"{label}: {r.title}")
+    if EXPERIENCE_CSV in tabs:
+        for r in index.select(EXPERIENCE_CSV, query):
+            for field, kind in _EXP_LINKS:
+                if getattr(r, field):
+                    add(getattr(r, field), f"Experience: {r.company} / {r.experience or r.position} [{kind}]")
+    return links
+
+
+# --- website data bundle ---
+_SITE_URL_RE = re.compile(r"(const SITE_DATA_URL = ')([^']*)(';)")
+
+def site_bundle(tabs)->bytes:
+    """Minified JSON of the SITE_TABS: per tab its columns and its rows as
+    arrays of stripped strings, blank rows dropped (as the page's own CSV
+    parser does)."""
+    out = {}
+    for key, url in SITE_TABS.items():
+        table = tabs[url]
+        rows = ([v.strip() for v in r] for r in table.rows)
+        out[key] = {"columns": [c.strip() for c in table.header], "rows": [r for r in rows if any(r)]}
+    return json.dumps({"version": 1, "tabs": out}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _kb(n:int)->str:
+    return f"{n / 1024:.1f} KB"
+
+def write_site_bundle(tabs):
+    """Write SITE_DATA_DIR/site-data.<hash>.json (+ .gz, .br) from fetched
+    tabs, point index.html's SITE_DATA_URL at it and drop all but the newest
+    SITE_KEEP bundles. Returns the JSON path."""
+    data = site_bundle(tabs)
+    path = SITE_DATA_DIR / f"site-data.{hashlib.sha256(data).hexdigest()[:12]}.json"
+    blobs = {"": data, ".gz": gzip.compress(data, 9, mtime=0)}
+    try:
+        import brotli  # optional: pip install brotli
+        blobs[".br"] = brotli.compress(data, quality=11)
+    except ImportError:
+        pass
+    for suffix, blob in blobs.items():
+        write_bytes_if_changed(path.with_name(path.name + suffix), blob)
+    os.utime(path)  # newest bundle by mtime, for pruning
+
+    url = path.relative_to(SITE_ROOT).as_posix()
+    html = SITE_INDEX.read_bytes().decode("utf-8")  # bytes in and out: index.html keeps its CRLFs
+    if not _SITE_URL_RE.search(html):
+        print(f"WARNING: no `const SITE_DATA_URL = '...';` line in {SITE_INDEX}; the page will not use {url}.")
+    elif write_if_changed(SITE_INDEX, _SITE_URL_RE.sub(lambda m: m.group(1) + url + m.group(3), html, count=1)):
+        print(f"Pointed {SITE_INDEX} at {url}.")
+
+    bundles = sorted(SITE_DATA_DIR.glob("site-data.*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in bundles[SITE_KEEP:]:
+        for suffix in ("", ".gz", ".br"):
+            old.with_name(old.name + suffix).unlink(missing_ok=True)
+
+    sizes = ", ".join(f"{name} {_kb(len(blobs[s]))}" for s, name in ((".gz", "gzip"), (".br", "brotli")) if s in blobs)
+    n = len(SITE_TABS)
+    print(f"Site bundle {url}: {_kb(len(data))} ({sizes}); {n} tabs in 1 same-origin request "
+          f"instead of {n} to Google ({n - 1} fewer per page view).")
+    return path
+
+
+# --- watch mode ---
+def _poll_interval(url:str, failures:int, rnd)->float:
+    base = WATCH_INTERVALS.get(url, WATCH_INTERVAL)
+    base = min(base * 2 ** failures, max(base, WATCH_MAX_BACKOFF))
+    return base * (1 + rnd.uniform(-WATCH_JITTER, WATCH_JITTER))
+
+def _start_latexmk():
+    """`latexmk -pvc` in the background: it watches main.tex and sections/ and
+    recompiles incrementally whenever a section is rewritten."""
+    if not shutil.which(WATCH_LATEXMK_CMD[0]):
+        print("latexmk not found; watching without a live PDF build.")
+        return None
+    Path("output").mkdir(exist_ok=True)
+    print("Started " + " ".join(WATCH_LATEXMK_CMD) + ".")
+    return subprocess.Popen(WATCH_LATEXMK_CMD, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def _publish_pdf(compile_first:bool):
+    import build_resume  # only needed for --sync
+    if compile_first:
+        try:
+            build_resume.compile_pdf()
+        except subprocess.CalledProcessError as error:
+            print(f"latexmk failed with exit status {error.returncode}; not syncing.")
+            return
+        except OSError as error:  # latexmk missing, unreadable output, ...
+            print(f"Could not compile the PDF ({error}); not syncing.")
+            return
+    build_resume.publish(build_resume.load_state(), build_resume.pdf_sha256())
+
+def watch(tabs, use_cache=True, latex=True, sync=False):
+    """Poll every tab on its own jittered interval with conditional requests
+    (at most FETCH_WORKERS polls in flight) and rewrite only the sections
+    built from tabs whose rows changed, once WATCH_DEBOUNCE seconds pass
+    without further changes. With `latex`, latexmk -pvc keeps the PDF
+    current; with `sync`, the PDF is published after it settles. Runs until
+    interrupted; `tabs` ({url: rows}) is the state after the initial build."""
+    rnd = random.Random()
+    urls = list(tabs)
+    failures = dict.fromkeys(urls, 0)
+    due = {u: time.monotonic() + _poll_interval(u, 0, rnd) for u in urls}
+    running, dirty = {}, set()
+    settle_at = written_at = pdf_seen = None
+    pdf_path = Path("output/generated_resume.pdf")
+    latexmk = _start_latexmk() if latex else None
+    pool = ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS))
+    print(f"Watching {len(urls)} tab(s); Ctrl-C to stop.")
+    try:
+        while True:
+            now = time.monotonic()
+            for u in urls:
+                if u not in running and now >= due[u]:
+                    running[u] = pool.submit(fetch_rows, u, use_cache=use_cache)
+            for u, future in list(running.items()):
+                if not future.done():
+                    continue
+                del running[u]
+                try:
+                    rows = future.result()
+                    failures[u] = 0
+                except requests.RequestException as error:
+                    failures[u] += 1
+                    print(f"WARNING: polling {_tab_label(u)} failed ({error}).")
+                    rows = tabs[u]
+                if rows != tabs[u]:
+                    tabs[u] = rows
+                    dirty.update(p for p, deps in section_tabs().items() if u in deps)
+                    settle_at = time.monotonic() + WATCH_DEBOUNCE
+                    print(f"{_tab_label(u)} changed.")
+                due[u] = time.monotonic() + _poll_interval(u, failures[u], rnd)
+
+            if dirty and time.monotonic() >= settle_at:
+                try:
+                    changed = write_sections(tabs, only=dirty)
+                except MissingColumnsError as error:
+                    print(f"ERROR: {error}; keeping the previous section.")
+                    changed = []
+                dirty.clear()
+                if changed and sync:
+                    if latexmk is None:
+                        _publish_pdf(compile_first=True)
+                    else:
+                        written_at, pdf_seen = time.time(), None
+
+            # with latexmk -pvc running, sync once the PDF is newer than the
+            # last write and has not changed for WATCH_SETTLE seconds
+            if written_at is not None:
+                try:
+                    mtime = pdf_path.stat().st_mtime
+                except FileNotFoundError:
+                    mtime = 0
+                if mtime > written_at:
+                    if pdf_seen is None or pdf_seen[0] != mtime:
+                        pdf_seen = (mtime, time.monotonic())
+                    elif time.monotonic() - pdf_seen[1] >= WATCH_SETTLE:
+                        written_at = None
+                        _publish_pdf(compile_first=False)
+            if latexmk is not None and latexmk.poll() is not None:
+                print(f"latexmk exited with status {latexmk.returncode}; compiling on demand from now on.")
+                latexmk = None
+            time.sleep(WATCH_TICK)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        if latexmk is not None and latexmk.poll() is None:
+            latexmk.terminate()
+            latexmk.wait()
+    return 0
+
+
+# --- main ---
+def _names(value):
+    return [n.strip().lower() for n in value.split(",") if n.strip()]
+
+def rebuild(only=None, skip=None, tags=None, use_cache=None, mode=None):
+    """Library entry point: fetch just the tabs the selected sections need
+    (see select_sections) and rewrite those sections if they changed; every
+    other section file is left untouched. Returns the rewritten paths."""
+    specs = select_sections(only, skip)
+    tabs = fetch_tabs(tab_urls(specs), mode=mode, use_cache=USE_CACHE if use_cache is None else use_cache)
+    return write_sections(tabs, only={spec.path for spec in specs.values()}, tags=tags)
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Regenerate the resume sections from the published Google Sheet.")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore and do not update the on-disk sheet cache")
+    ap.add_argument("--ingest", choices=("csv", "workbook"), default=INGEST_MODE,
+                    help="one CSV request per tab, or one workbook download split locally "
+                         "(sheets with formatted numbers still come as CSV)")
+    ap.add_argument("--stream", action="store_true",
+                    help="stream rows from each CSV straight into its .tex file (flat memory for huge tabs)")
+    ap.add_argument("--trace", nargs="?", const=True, metavar="PATH",
+                    help="record per-stage timing spans as Chrome trace JSON (default .cache/trace.json)")
+    ap.add_argument("--deadline", type=float, default=BUILD_DEADLINE, metavar="SECONDS",
+                    help="give up on tabs not fetched within this time (cached copies are used; "
+                         f"default {BUILD_DEADLINE})")
+    ap.add_argument("--only", type=_names, metavar="NAMES",
+                    help="comma-separated sections to rebuild, fetching only their tabs "
+                         f"({', '.join(sections())}); the other .tex files are left alone")
+    ap.add_argument("--skip", type=_names, metavar="NAMES",
+                    help="comma-separated sections not to rebuild")
+    ap.add_argument("--no-site", action="store_true",
+                    help="do not write the website data bundle (SITE_BUNDLE; implied by --only/--skip)")
+    ap.add_argument("--check-links", nargs="?", const="warn", choices=("warn", "fail"),
+                    help="check every link in the resume (check_links.py); with 'fail', "
+                         f"exit {EXIT_DEAD_LINKS} if one is dead")
+    ap.add_argument("--exit-unchanged", action="store_true",
+                    help=f"exit {EXIT_UNCHANGED} instead of 0 when no section changed")
+    ap.add_argument("--watch", action="store_true",
+                    help="keep running: poll each tab and rewrite only the sections whose rows changed")
+    ap.add_argument("--no-latex", action="store_true",
+                    help="with --watch, do not keep `latexmk -pvc` running")
+    ap.add_argument("--sync", action="store_true",
+                    help="with --watch, publish the PDF to Drive once it settles after a change")
+    args = ap.parse_args(argv)
+    if args.watch and args.stream:
+        ap.error("--watch keeps every tab's rows in memory and cannot be combined with --stream")
+    if args.check_links and args.stream:
+        ap.error("--check-links needs the fetched rows and cannot be combined with --stream")
+    try:
+        args.sections = select_sections(args.only, args.skip)
+    except ValueError as error:
+        ap.error(str(error))
+    if not args.sections:
+        ap.error("no section left to build")
+    return args
+
+def main(argv=None):
+    """Returns 0 on success, or EXIT_UNCHANGED with --exit-unchanged if no
+    section changed."""
+    args = parse_args(argv)
+    use_cache = USE_CACHE and not args.no_cache
+    owns_trace = tracing.start(args.trace)
+    fetch_policy.start(args.deadline)
+
+    specs = args.sections
+    urls = tab_urls(specs)
+    targeted = args.only is not None or args.skip is not None
+    if targeted:
+        print(f"Building {', '.join(specs)} from {len(urls)} tab(s).")
+    # a bundle needs every site tab, which a targeted rebuild does not fetch
+    site = SITE_BUNDLE and not args.no_site and not targeted and SITE_INDEX.exists()
+    if args.stream:
+        # lazy: each tab is requested only when its section is being written
+        tabs = {u: iter_rows(u, use_cache=use_cache) for u in urls if not u.startswith("PASTE_")}
     else:
-        pubs_out, pats_out = pats, pubs
-    PUBS_TEX.parent.mkdir(parents=True, exist_ok=True)
-    PUBS_TEX.write_text(build_publications_tex(pubs_out, pats_out), encoding="utf-8")
-
-    # achievements
-    if not ACHIEVEMENTS_CSV.startswith("PASTE_"):
-        ach_rows = [norm_ach_row(r) for r in fetch_rows(ACHIEVEMENTS_CSV)]
-        ach_items = [r["latex_update"] for r in ach_rows if r["latex_update"] and tag_has_resume(r["tag"])]
-        ACHV_TEX.parent.mkdir(parents=True, exist_ok=True)
-        ACHV_TEX.write_text(build_achievements_tex(ach_items), encoding="utf-8")
-
-    # education
-    if not EDUCATION_CSV.startswith("PASTE_"):
-        edu_rows = [norm_edu_row(r) for r in fetch_rows(EDUCATION_CSV)]
-        EDU_TEX.parent.mkdir(parents=True, exist_ok=True)
-        EDU_TEX.write_text(build_education_tex(edu_rows), encoding="utf-8")
-
-    # research
-    if not RESEARCH_CSV.startswith("PASTE_"):
-        research_rows = [norm_research_row(r) for r in fetch_rows(RESEARCH_CSV)]
-        paragraphs = [r["text"] for r in research_rows if r["text"] and tag_has_resume(r["tag"])]
-        RES_TEX.parent.mkdir(parents=True, exist_ok=True)
-        text = build_research_tex(paragraphs) + r"\par\medskip" + "\n"
-        RES_TEX.write_text(text, encoding="utf-8")
-
-    # NEW: experience
-    if not EXPERIENCE_CSV.startswith("PASTE_"):
-        exp_rows_all = [norm_experience_row(r) for r in fetch_rows(EXPERIENCE_CSV)]
-        EXP_TEX.parent.mkdir(parents=True, exist_ok=True)
-        EXP_TEX.write_text(build_experience_tex(exp_rows_all), encoding="utf-8")
-    
-    if not SKILLS_CSV.startswith("PASTE_"):
-        skills_rows = fetch_rows(SKILLS_CSV)
-        SKL_TEX.parent.mkdir(parents=True, exist_ok=True)
-        SKL_TEX.write_text(build_skills_tex(skills_rows), encoding="utf-8")
-
-    print(f"Wrote {PUBS_TEX}.")
-    if not ACHIEVEMENTS_CSV.startswith("PASTE_"):
-        print(f"Wrote {ACHV_TEX}.")
-    if not EDUCATION_CSV.startswith("PASTE_"):
-        print(f"Wrote {EDU_TEX}.")
-    if not RESEARCH_CSV.startswith("PASTE_"):
-        print(f"Wrote {RES_TEX}.")
-    if not EXPERIENCE_CSV.startswith("PASTE_"):
-        print(f"Wrote {EXP_TEX}.")
+        # all tabs at once; wall time is the slowest tab instead of the sum
+        tabs = fetch_tabs(urls, mode=args.ingest, use_cache=use_cache)
+    if use_cache:
+        prune_cache()
+
+    try:
+        changed = write_sections(tabs, only={spec.path for spec in specs.values()})
+        if site:
+            # only now, so a website-only tab that fails cannot stop the resume
+            shared = {} if args.stream else tabs  # streamed tabs were consumed by their sections
+            try:
+                fetched = fetch_tabs([u for u in SITE_TABS.values() if u not in shared],
+                                     mode=args.ingest, use_cache=use_cache)
+            except requests.RequestException as error:
+                print(f"WARNING: website tabs not fetched ({error}); site bundle not written.")
+            else:
+                with tracing.span("site bundle", "site"):
+                    write_site_bundle({**shared, **fetched})
+        dead = 0
+        if args.check_links:
+            import check_links
+            dead = check_links.run(collect_links(tabs), use_cache=use_cache)
+    except MissingColumnsError as error:
+        print(f"ERROR: {error}")
+        return EXIT_BAD_SHEET
+    finally:
+        if FETCH_POLICY and fetch_policy.summary():
+            print(fetch_policy.summary())
+            fetch_policy.save()
+        if owns_trace:
+            tracing.finish()
+    if dead and args.check_links == "fail":
+        return EXIT_DEAD_LINKS
+    if args.watch:
+        fetch_policy.start(None)  # polling has no deadline
+        return watch(tabs, use_cache=use_cache, latex=not args.no_latex, sync=args.sync)
+    if not changed:
+        print("No section changed.")
+        return EXIT_UNCHANGED if args.exit_unchanged else 0
+    return 0
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# Pipeline driver: regenerate sections -> latexmk -> Drive sync, skipping the
+# expensive stages when their inputs have not changed since the last run.
+import argparse, hashlib, json, os, re, shutil, subprocess, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import build_and_compile
+import tracing
+
+# === Paths ===
+MAIN_TEX     = Path("main.tex")
+SECTIONS_DIR = Path("sections")
+PDF_PATH     = Path("output/generated_resume.pdf")
+STATE_PATH   = Path(".cache/build_state.json")
+
+LATEXMK_CMD = ["latexmk", "-pdf", "-interaction=nonstopmode", "-halt-on-error",
+               "-jobname=output/generated_resume", "main.tex"]
+TOOLCHAIN   = ["latexmk", "pdflatex"]
+
+# === Precompiled preamble (mylatexformat) ===
+# main.tex up to \csname endofdump\endcsname (or \begin{document}) is dumped
+# once into FORMAT_DIR/preamble-<key>.fmt, keyed by a hash of that text and the
+# engine binary (tool_id), and compiles start from the format instead of loading
+# every package again. Anything after the marker (hyperref, which does not
+# survive a dump) still runs each time. Needs mylatexformat.ltx; if the dump
+# fails, builds go on without a format until the preamble or engine changes.
+USE_FORMAT    = True
+FORMAT_DIR    = Path(".cache/fmt")
+FORMAT_ENGINE = "pdflatex"
+
+# === Variants (--variants) ===
+# Each variant keeps the rows carrying any of its tags (and, if given, all of
+# "all_tags" and none of "exclude_tags") and \input's its sections (stems
+# under sections/) in the given order; None keeps main.tex's own list. All
+# are generated from one fetch into VARIANTS_DIR/<name>/ and compiled
+# concurrently to output/<output>.pdf.
+VARIANTS = {
+    "academic": {"tags": ["resume", "academic"], "sections": None,
+                 "output": "Rwik_Rana_CV_academic"},
+    "industry": {"tags": ["resume", "industry"],
+                 "sections": ["experience", "education", "publications", "skills"],
+                 "output": "Rwik_Rana_resume_industry"},
+    "full":     {"tags": ["resume", "academic", "industry", "cv"],
+                 "sections": ["research", "education", "experience", "publications", "achievments", "skills"],
+                 "output": "Rwik_Rana_CV_full"},
+}
+VARIANTS_DIR = Path("output/variants")
+VARIANT_JOBS = min(4, os.cpu_count() or 1)   # latexmk processes at once
+
+
+def _sha256_bytes(data:bytes)->str:
+    return hashlib.sha256(data).hexdigest()
+
+def load_state(path:Path=STATE_PATH)->dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state:dict, path:Path=STATE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+def tool_id(tool:str)->str:
+    """Identify an installed tool by resolved path, size and mtime. Any
+    upgrade changes at least one of them, and it avoids spawning
+    `pdflatex --version` on every run. Raises FileNotFoundError if the tool
+    is not on PATH."""
+    exe = shutil.which(tool)
+    if not exe:
+        raise FileNotFoundError(f"{tool} is not on PATH")
+    real = os.path.realpath(exe)
+    st = os.stat(real)
+    return f"{tool}:{real}:{st.st_size}:{int(st.st_mtime)}"
+
+def toolchain_fingerprint():
+    """tool_id of every TOOLCHAIN tool, missing ones included."""
+    parts = []
+    for tool in TOOLCHAIN:
+        try:
+            parts.append(tool_id(tool))
+        except FileNotFoundError:
+            parts.append(f"{tool}:missing")
+    return "|".join(parts)
+
+def _inputs(root:Path):
+    return [root / MAIN_TEX] + sorted(p for p in (root / SECTIONS_DIR).rglob("*") if p.is_file())
+
+def input_fingerprint(root:Path=Path(".")):
+    """Hash of everything the PDF depends on: main.tex, every file under
+    sections/ (name + content) and the toolchain."""
+    h = hashlib.sha256()
+    h.update(toolchain_fingerprint().encode("utf-8"))
+    for p in _inputs(root):
+        h.update(b"\0" + p.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+def pdf_sha256():
+    try:
+        return _sha256_bytes(PDF_PATH.read_bytes())
+    except FileNotFoundError:
+        return None
+
+# --- precompiled preamble ---
+_DUMP_RE = re.compile(r"^[ \t]*(\\csname[ \t]+endofdump\\endcsname|\\begin\{document\})", re.M)
+_FORMAT_LOCK = threading.Lock()
+
+def preamble(text:str):
+    """The part of a main.tex that goes into the format, or None."""
+    m = _DUMP_RE.search(text)
+    return text[:m.start()] if m else None
+
+def format_name(root:Path=Path(".")):
+    """preamble-<key> for root/main.tex, or None if it has no preamble."""
+    text = preamble((root / MAIN_TEX).read_text(encoding="utf-8"))
+    if text is None:
+        return None
+    key = _sha256_bytes(f"{tool_id(FORMAT_ENGINE)}\0{text}".encode("utf-8"))[:16]
+    return f"preamble-{key}"
+
+def _dump_format(name:str, text:str)->bool:
+    FORMAT_DIR.mkdir(parents=True, exist_ok=True)
+    job = f"{name}.{os.getpid()}"
+    (FORMAT_DIR / f"{job}.tex").write_text(text + "\\begin{document}\n\\end{document}\n", encoding="utf-8")
+    cmd = [FORMAT_ENGINE, "-ini", "-interaction=nonstopmode", "-halt-on-error", f"-jobname={job}",
+           f"&{FORMAT_ENGINE}", "mylatexformat.ltx", f"{job}.tex"]
+    t = time.perf_counter()
+    with tracing.span("dump format", "latex", format=name):
+        p = subprocess.run(cmd, cwd=FORMAT_DIR, capture_output=True, text=True)
+    for suffix in (".tex", ".log"):
+        (FORMAT_DIR / f"{job}{suffix}").unlink(missing_ok=True)
+    if p.returncode != 0 or not (FORMAT_DIR / f"{job}.fmt").exists():
+        tail = "\n".join(p.stdout.splitlines()[-10:])
+        print(f"WARNING: could not dump the preamble format (exit {p.returncode}); "
+              f"compiling without it.\n{tail}")
+        (FORMAT_DIR / f"{job}.fmt").unlink(missing_ok=True)
+        (FORMAT_DIR / f"{name}.failed").touch()
+        return False
+    os.replace(FORMAT_DIR / f"{job}.fmt", FORMAT_DIR / f"{name}.fmt")
+    for old in FORMAT_DIR.glob("preamble-*"):
+        if old.stem != name:
+            old.unlink(missing_ok=True)
+    print(f"Dumped preamble format {name} in {time.perf_counter() - t:.2f}s.")
+    return True
+
+def ensure_format(root:Path=Path(".")):
+    """Name of the up-to-date preamble format for root/main.tex, dumping it
+    first if needed, or None to compile without one."""
+    if not USE_FORMAT:
+        return None
+    try:
+        name = format_name(root)
+    except OSError as error:
+        print(f"WARNING: no preamble format ({error}).")
+        return None
+    if name is None:
+        return None
+    with _FORMAT_LOCK:  # variants compile from several threads
+        if (FORMAT_DIR / f"{name}.fmt").exists():
+            return name
+        if (FORMAT_DIR / f"{name}.failed").exists():
+            return None
+        text = preamble((root / MAIN_TEX).read_text(encoding="utf-8"))
+        return name if _dump_format(name, text) else None
+
+def compile_pdf(root:Path=Path("."), jobname:str="output/generated_resume", quiet:bool=False,
+                use_format:bool=True):
+    """latexmk main.tex under root; the PDF lands at root/<jobname>.pdf.
+    quiet captures latexmk's output (for parallel builds); it is attached to
+    the CalledProcessError on failure. Returns the preamble format used, if
+    any (see ensure_format)."""
+    # Pin the PDF timestamps to the newest input so identical inputs give a
+    # byte-identical PDF (pdfTeX honours SOURCE_DATE_EPOCH).
+    env = dict(os.environ,
+               SOURCE_DATE_EPOCH=str(int(max(p.stat().st_mtime for p in _inputs(root)))),
+               FORCE_SOURCE_DATE="1")
+    (root / jobname).parent.mkdir(parents=True, exist_ok=True)
+    cmd = [f"-jobname={jobname}" if c.startswith("-jobname=") else c for c in LATEXMK_CMD]
+    fmt = ensure_format(root) if use_format else None
+    if fmt:
+        # the trailing separator keeps kpathsea's default format path too
+        env["TEXFORMATS"] = str(FORMAT_DIR.resolve()) + os.pathsep + env.get("TEXFORMATS", "")
+        cmd[-1:-1] = [f"-pdflatex={FORMAT_ENGINE} -fmt={fmt} %O %S"]
+    subprocess.run(cmd, check=True, env=env, cwd=root, capture_output=quiet, text=quiet)
+    return fmt
+
+def publish(state:dict, pdf_hash:str, force:bool=False)->bool:
+    """Sync the PDF to Drive unless this exact PDF was already published.
+    Records the result in state; returns False if the sync failed."""
+    if not force and pdf_hash == state.get("published_sha256"):
+        print(f"PDF already published (Drive file {state.get('drive_file_id')}); skipping upload.")
+        return True
+    import cv_sync_google  # Google client stack is only needed when publishing
+    with tracing.span("publish", "publish", bytes=PDF_PATH.stat().st_size):
+        file_id = cv_sync_google.main()
+    if not file_id:
+        return False
+    state.update(published_sha256=pdf_hash, drive_file_id=file_id)
+    save_state(state)
+    return True
+
+
+# --- variants ---
+_INPUT_RE = re.compile(r"^[ \t]*\\input\{sections/([^}]+)\}[ \t]*$", re.M)
+
+def variant_main_tex(sections):
+    """main.tex with its active section \\input lines replaced by `sections`,
+    in that order (None keeps it as is)."""
+    text = MAIN_TEX.read_text(encoding="utf-8")
+    if sections is None:
+        return text
+    slots = list(_INPUT_RE.finditer(text))
+    if not slots:
+        raise ValueError(f"{MAIN_TEX} has no \\input{{sections/...}} lines to replace")
+    lines = "\n".join(f"\\input{{sections/{name}}}" for name in sections)
+    # the whole list goes where the first section was; the other slots are dropped
+    out, pos = [], 0
+    for i, m in enumerate(slots):
+        out.append(text[pos:m.start()])
+        if i == 0:
+            out.append(lines)
+        pos = m.end() + (1 if i and text[m.end():m.end() + 1] == "\n" else 0)
+    out.append(text[pos:])
+    return "".join(out)
+
+def generate_variant(name, variant, tabs):
+    """Write VARIANTS_DIR/<name>/ (main.tex + sections/) from fetched tabs."""
+    root = VARIANTS_DIR / name
+    wanted = variant.get("sections")
+    section_paths = build_and_compile.section_tabs()
+    if wanted is not None:
+        unknown = set(wanted) - {p.stem for p in section_paths}
+        if unknown:
+            raise ValueError(f"variant {name!r}: unknown section(s) {', '.join(sorted(unknown))}")
+        section_paths = {p for p in section_paths if p.stem in wanted}
+    query = build_and_compile.tag_query(variant["tags"], variant.get("all_tags", ()), variant.get("exclude_tags", ()))
+    build_and_compile.write_sections(tabs, only=set(section_paths), tags=query, out_dir=root)
+    build_and_compile.write_if_changed(root / MAIN_TEX, variant_main_tex(wanted))
+    return root
+
+def _compile_variant(name, variant, root, use_format=True):
+    t = time.perf_counter()
+    with tracing.span(f"latexmk {name}", "latex"):
+        compile_pdf(root, jobname=variant["output"], quiet=True, use_format=use_format)
+    pdf = Path("output") / f"{variant['output']}.pdf"
+    shutil.copyfile(root / f"{variant['output']}.pdf", pdf)
+    return pdf, time.perf_counter() - t
+
+def build_variants(names, args):
+    """Fetch once, generate every variant, compile the stale ones with up to
+    VARIANT_JOBS latexmk processes, and print an estimate of the serial time."""
+    t0 = time.perf_counter()
+    state = load_state()
+    built = state.setdefault("variants", {})
+    wanted = [VARIANTS[n].get("sections") for n in names]
+    only = None if None in wanted else {s for w in wanted for s in w}
+    specs = build_and_compile.select_sections(only)
+    with tracing.span("fetch", "generate"):  # just the tabs the variants' sections need
+        tabs = build_and_compile.fetch_tabs(build_and_compile.tab_urls(specs),
+                                            use_cache=build_and_compile.USE_CACHE and not args.no_cache)
+    fetched = time.perf_counter() - t0
+
+    todo = {}
+    for name in names:
+        variant = VARIANTS[name]
+        try:
+            root = generate_variant(name, variant, tabs)
+        except build_and_compile.MissingColumnsError as error:
+            print(f"ERROR: {error}")
+            return build_and_compile.EXIT_BAD_SHEET
+        fingerprint = input_fingerprint(root)
+        if not args.force and built.get(name) == fingerprint and (Path("output") / f"{variant['output']}.pdf").exists():
+            print(f"{name}: up to date.")
+            continue
+        todo[name] = (variant, root, fingerprint)
+
+    failed, timings = [], {}
+    t_compile = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(VARIANT_JOBS, len(todo) or 1))) as pool:
+        futures = {name: pool.submit(_compile_variant, name, v, root, not args.no_format)
+                   for name, (v, root, _) in todo.items()}
+        for name, future in futures.items():
+            try:
+                pdf, seconds = future.result()
+            except subprocess.CalledProcessError as error:
+                tail = "\n".join((error.stdout or "").splitlines()[-15:])
+                print(f"{name}: latexmk failed with exit status {error.returncode}.\n{tail}")
+                failed.append(name)
+                continue
+            except OSError as error:  # latexmk missing, unreadable output, ...
+                print(f"{name}: {error}")
+                failed.append(name)
+                continue
+            timings[name] = seconds
+            built[name] = todo[name][2]
+            print(f"{name}: wrote {pdf} ({seconds:.2f}s).")
+    compile_wall = time.perf_counter() - t_compile
+    save_state(state)
+
+    total = time.perf_counter() - t0
+    if timings:
+        # not measured: what one fetch per variant plus compiling them one
+        # after another would take, from this run's own timings
+        serial = fetched * len(names) + sum(timings.values())
+        print(f"{len(timings)} variant(s) compiled in {compile_wall:.2f}s wall "
+              f"with {min(VARIANT_JOBS, len(todo))} job(s); total {total:.2f}s. Estimated serial time "
+              f"(a fetch per variant + the compile times added up): ~{serial:.2f}s, "
+              f"about {serial / total:.1f}x longer.")
+    else:
+        print(f"Done in {total:.2f}s.")
+    return 1 if failed else 0
+
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Build the resume PDF and publish it to Google Drive.")
+    ap.add_argument("--force", action="store_true",
+                    help="recompile and republish even if nothing changed")
+    ap.add_argument("--no-publish", action="store_true",
+                    help="stop after building the PDF")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore the on-disk sheet cache when fetching")
+    ap.add_argument("--no-format", action="store_true",
+                    help="compile without the precompiled preamble format")
+    ap.add_argument("--trace", nargs="?", const=True, metavar="PATH",
+                    help="record per-stage timing spans as Chrome trace JSON (default .cache/trace.json)")
+    ap.add_argument("--variants", nargs="?", const=",".join(VARIANTS), metavar="NAMES",
+                    help="build the comma-separated VARIANTS (default: all) instead of the main PDF; never publishes")
+    args = ap.parse_args(argv)
+    if args.variants is not None:
+        args.variants = [v for v in args.variants.split(",") if v]
+        unknown = [v for v in args.variants if v not in VARIANTS]
+        if unknown:
+            ap.error(f"unknown variant(s): {', '.join(unknown)} (have {', '.join(VARIANTS)})")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    owns_trace = tracing.start(args.trace)
+    try:
+        return build_variants(args.variants, args) if args.variants else run(args)
+    finally:
+        if owns_trace:
+            tracing.finish()
+
+def run(args):
+    t0 = time.perf_counter()
+    state = load_state()
+
+    gen_args = ["--no-cache"] if args.no_cache else []
+    with tracing.span("generate sections", "generate"):
+        status = build_and_compile.main(gen_args)
+    if status:  # no --exit-unchanged: the fingerprint below decides whether to compile
+        return status
+
+    with tracing.span("fingerprint", "fingerprint"):
+        fingerprint = input_fingerprint()
+        pdf_hash = pdf_sha256()
+    if (not args.force and pdf_hash
+            and state.get("input_hash") == fingerprint
+            and state.get("pdf_sha256") == pdf_hash):
+        print(f"Build cache hit; reusing {PDF_PATH}.")
+    else:
+        try:
+            t = time.perf_counter()
+            with tracing.span("latexmk", "latex") as sp:
+                fmt = compile_pdf(use_format=not args.no_format)
+                sp.set(format=fmt)
+        except subprocess.CalledProcessError as error:
+            print(f"latexmk failed with exit status {error.returncode}.")
+            return error.returncode
+        except OSError as error:  # latexmk or pdflatex missing, unreadable inputs, ...
+            print(f"ERROR: could not compile the PDF: {error}")
+            return 1
+        print(f"latexmk took {time.perf_counter() - t:.2f}s"
+              + (f" with preamble format {fmt}." if fmt else " without a preamble format."))
+        pdf_hash = pdf_sha256()
+        state.update(input_hash=fingerprint, pdf_sha256=pdf_hash)
+        save_state(state)
+
+    if not args.no_publish and not publish(state, pdf_hash, force=args.force):
+        return 1
+
+    print(f"Done in {time.perf_counter() - t0:.2f}s.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,3 @@
-python3 build_and_compile.py
-latexmk -pdf -interaction=nonstopmode -halt-on-error -jobname=output/generated_resume main.tex
-python3 cv_sync_google.py
\ No newline at end of file
+#!/bin/sh
+# Kept for existing habits; the pipeline lives in build_resume.py.
+cd "$(dirname "$0")" && exec python3 build_resume.py "$@"
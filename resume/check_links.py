@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# pip install requests
+# Checks every link the resume emits: publication/patent [link]s and the
+# experience [Paper]/[Code]/[Website]/[Video]/[Image] links, for the rows the
+# resume selects.
+#   python3 check_links.py [--fail] [--no-cache] [--report links.json]
+#   python3 build_and_compile.py --check-links [fail]
+# URLs are checked concurrently over one keep-alive session, at most
+# LINK_PER_HOST at a time per host, with HEAD first and GET if HEAD is refused
+# or fails. Results are kept in LINK_CACHE for LINK_TTL (LINK_TTL_BAD for links
+# that did not come back OK), so repeat runs only check new or expired URLs.
+import argparse, json, os, sys, threading, time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import tracing
+
+# === Config ===
+LINK_WORKERS  = 16                 # URLs in flight overall
+LINK_PER_HOST = 2                  # ... and per host, to stay polite
+LINK_TIMEOUT  = 10                 # seconds per request
+LINK_TTL      = 7 * 24 * 3600      # an OK result is trusted this long
+LINK_TTL_BAD  = 6 * 3600           # dead / unknown links are re-checked sooner
+LINK_CACHE    = Path(".cache/links.json")
+LINK_HEADERS  = {"User-Agent": "Mozilla/5.0 (compatible; resume-link-check)"}
+# Statuses that say more about the site's bot policy than about the link;
+# reported as "unknown" and never fail the build.
+LINK_UNKNOWN  = {401, 403, 429, 999}
+
+
+def _load_cache():
+    try:
+        return json.loads(LINK_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    LINK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = LINK_CACHE.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(cache, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, LINK_CACHE)
+
+def _fresh(result, now):
+    ttl = LINK_TTL if result["state"] == "ok" else LINK_TTL_BAD
+    return now - result["checked"] < ttl
+
+def _session(workers, per_host):
+    s = requests.Session()
+    s.headers.update(LINK_HEADERS)
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=per_host)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+def _state(status):
+    if status < 400:
+        return "ok"
+    return "unknown" if status in LINK_UNKNOWN else "dead"
+
+def check_url(session, url, timeout=LINK_TIMEOUT):
+    """One URL: HEAD (following redirects), then GET without reading the body
+    if HEAD errors or is answered with 4xx/5xx. Returns the cache record."""
+    t = time.perf_counter()
+    result = {"status": None, "error": None, "method": "HEAD", "final": url, "redirects": 0}
+    try:
+        r = session.head(url, allow_redirects=True, timeout=timeout)
+        r.close()
+    except requests.RequestException:
+        r = None
+    if r is None or r.status_code >= 400:
+        result["method"] = "GET"
+        try:
+            r = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+            r.close()
+        except requests.RequestException as error:
+            r, result["error"] = None, f"{type(error).__name__}: {error}"
+    if r is not None:
+        result.update(status=r.status_code, final=r.url, redirects=len(r.history),
+                      moved=any(h.status_code in (301, 308) for h in r.history))
+    result["state"] = _state(r.status_code) if r is not None else "dead"
+    result["seconds"] = round(time.perf_counter() - t, 3)
+    result["checked"] = time.time()
+    return result
+
+def _interleave(urls):
+    """URLs round-robin by host, so the pool is not stuck behind one site."""
+    by_host = defaultdict(list)
+    for u in urls:
+        by_host[urlsplit(u).netloc.lower()].append(u)
+    return [u for u in chain.from_iterable(zip_longest(*by_host.values())) if u]
+
+def check_links(urls, use_cache=True, workers=LINK_WORKERS, per_host=LINK_PER_HOST, timeout=LINK_TIMEOUT):
+    """{url: result} for every URL, checking only those without a fresh
+    cached result. Returns (results, number checked now)."""
+    cache = _load_cache() if use_cache else {}
+    now = time.time()
+    results = {u: cache[u] for u in urls if u in cache and _fresh(cache[u], now)}
+    todo = _interleave([u for u in urls if u not in results])
+    if todo:
+        hosts = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        lock = threading.Lock()
+        session = _session(workers, per_host)
+
+        def one(url):
+            with lock:
+                gate = hosts[urlsplit(url).netloc.lower()]
+            with gate, tracing.span("link", "links", url=url) as sp:
+                result = check_url(session, url, timeout)
+                sp.set(status=result["status"], method=result["method"])
+            return url, result
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(todo)))) as pool:
+            for url, result in pool.map(one, todo):
+                results[url] = result
+        session.close()
+        if use_cache:
+            cache.update({u: results[u] for u in todo})
+            _save_cache({u: r for u, r in cache.items() if _fresh(r, now) or u in results})
+    return results, len(todo)
+
+def report(links, results, checked, seconds):
+    """Print dead and unknown links with where they appear; returns the
+    number of dead links."""
+    counts = defaultdict(int)
+    for url in links:
+        counts[results[url]["state"]] += 1
+    for state in ("dead", "unknown"):
+        for url in sorted(u for u in links if results[u]["state"] == state):
+            r = results[url]
+            why = f"HTTP {r['status']}" if r["status"] else r["error"][:120]
+            print(f"{state.upper():8s} {url}  ({why})")
+            for where in links[url]:
+                print(f"           in {where}")
+    moved = sum(1 for u in links if results[u].get("moved"))
+    print(f"Links: {len(links)} ({checked} checked, {len(links) - checked} cached) in {seconds:.2f}s: "
+          f"{counts['ok']} ok, {counts['dead']} dead, {counts['unknown']} unknown"
+          + (f"; {moved} permanently moved" if moved else "") + ".")
+    return counts["dead"]
+
+def run(links, use_cache=True, report_path=None):
+    """Check {url: [where]} (build_and_compile.collect_links) and print the
+    report; returns the number of dead links."""
+    t = time.perf_counter()
+    with tracing.span("check links", "links", urls=len(links)):
+        results, checked = check_links(list(links), use_cache=use_cache)
+    dead = report(links, results, checked, time.perf_counter() - t)
+    if report_path:
+        Path(report_path).write_text(json.dumps({u: dict(results[u], where=links[u]) for u in sorted(links)},
+                                                indent=1), encoding="utf-8")
+        print(f"Wrote {report_path}.")
+    return dead
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check the links the resume emits.")
+    ap.add_argument("--fail", action="store_true", help="exit 5 (EXIT_DEAD_LINKS) if any link is dead")
+    ap.add_argument("--no-cache", action="store_true", help="re-check every link and leave the cache alone")
+    ap.add_argument("--report", metavar="PATH", help="also write every result as JSON")
+    args = ap.parse_args(argv)
+    import build_and_compile as bc
+    tabs = bc.fetch_tabs(bc.link_tabs(), use_cache=bc.USE_CACHE)
+    dead = run(bc.collect_links(tabs), use_cache=not args.no_cache, report_path=args.report)
+    return bc.EXIT_DEAD_LINKS if dead and args.fail else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,25 @@
+import json
 import os.path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload
+import random
+import time
+
+import tracing
+
+# The Google client stack (googleapiclient, google-auth, oauthlib) is imported
+# on first use by _import_google(), not at module load: it is most of this
+# script's startup time and build_resume.py imports us even on runs that end
+# up publishing nothing.
+
+
+class _NotLoaded(Exception):
+    """Stand-in for HttpError until the client library is imported; never raised."""
+
+
+HttpError = _NotLoaded
+MediaFileUpload = None
+# Errors from a dropped or failed connection: socket errors plus httplib2's own
+# (e.g. ServerNotFoundError), which are not OSErrors.
+TransportError = OSError
 
 # --- USER CONFIGURATION: YOU MAY EDIT THESE VALUES ---
 
@@ -24,32 +39,264 @@ DRIVE_FILE_NAME = "Rwik_Rana_CV.pdf"
 # Trash old files by default (safer). Set True to permanently delete.
 PERMANENT_DELETE = False
 
+# Resumable upload: chunk size must be a multiple of 256 KiB.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+UPLOAD_MAX_RETRIES = 6                      # per chunk, with exponential backoff
+UPLOAD_SESSION_FILE = ".cache/upload_session.json"  # lets an interrupted upload resume
+
+# Push each publish as a new revision of one stable Drive file instead of
+# creating a new file; the ID in the sheet (and the website's links) never
+# change, and sharing/sheet writes are skipped once they are in place.
+UPDATE_IN_PLACE = True
+SYNC_STATE_FILE = ".cache/cv_sync_state.json"
+
+# Cleanup and permission calls are sent as Drive batch requests.
+BATCH_SIZE = 100          # Drive's per-batch limit
+BATCH_MAX_RETRIES = 3     # rounds of re-sending items that failed with 429/5xx
+
+# Discovery documents are read from this cache (trimmed to the resources we
+# call) instead of being loaded and parsed in full on every run. Entries are
+# keyed by the googleapiclient version; bump DISCOVERY_CACHE_VERSION to drop
+# them after changing DISCOVERY_RESOURCES.
+DISCOVERY_CACHE_DIR = ".cache/discovery"
+DISCOVERY_CACHE_VERSION = 1
+DISCOVERY_RESOURCES = {
+    ("drive", "v3"): ("files", "permissions"),
+    ("sheets", "v4"): ("spreadsheets",),
+}
+
 # --- END OF USER CONFIGURATION ---
 
 
+def _import_google():
+    """Imports the parts of the Google client used everywhere in this module."""
+    global HttpError, MediaFileUpload, TransportError
+    if MediaFileUpload is None:
+        import httplib2
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import MediaFileUpload
+        TransportError = (OSError, httplib2.HttpLib2Error)
+
+
+def _atomic_write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+_CREDS = None
+
+
 def get_credentials():
-    creds = None
-    if os.path.exists("token.json"):
+    """Returns valid OAuth credentials. They are kept in memory for the rest of
+    the process, and token.json is only rewritten (atomically) when the token
+    was refreshed or newly granted."""
+    global _CREDS
+    if _CREDS is not None and _CREDS.valid:
+        return _CREDS
+    _import_google()
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    creds = _CREDS
+    if creds is None and os.path.exists("token.json"):
         creds = Credentials.from_authorized_user_file("token.json", SCOPES)
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
+            from google_auth_oauthlib.flow import InstalledAppFlow
+
             flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
             creds = flow.run_local_server(port=0)
-        with open("token.json", "w") as token:
-            token.write(creds.to_json())
+        _atomic_write("token.json", creds.to_json())
+    _CREDS = creds
     return creds
 
 
-def upload_file_to_drive(service, file_path, file_name):
-    """Uploads a file to Google Drive and returns the file ID."""
+def _discovery_doc(api, version):
+    """Trimmed discovery document for api/version as a JSON string, from the
+    on-disk cache or, on a miss, from the library's bundled static copy.
+    Returns None if neither is available."""
+    try:
+        from googleapiclient.version import __version__ as client_version
+    except ImportError:  # googleapiclient 1.x
+        from googleapiclient import __version__ as client_version
+
+    path = os.path.join(
+        DISCOVERY_CACHE_DIR,
+        f"{api}.{version}.{client_version}.{DISCOVERY_CACHE_VERSION}.json",
+    )
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        pass
+    from googleapiclient.discovery_cache import get_static_doc
+
+    doc = get_static_doc(api, version)
+    if not doc:
+        return None
+    doc = json.loads(doc)
+    keep = DISCOVERY_RESOURCES.get((api, version))
+    if keep:
+        doc["resources"] = {k: v for k, v in doc.get("resources", {}).items() if k in keep}
+    doc.pop("description", None)
+    text = json.dumps(doc, separators=(",", ":"))
+    _atomic_write(path, text)
+    return text
+
+
+def build_service(api, version, credentials):
+    """Like googleapiclient.discovery.build, but from the cached discovery document."""
+    _import_google()
+    from googleapiclient.discovery import build, build_from_document
+
+    with tracing.span(f"build {api} {version}", "setup") as sp:
+        doc = _discovery_doc(api, version)
+        if doc is None:
+            sp.set(discovery="network")
+            return build(api, version, credentials=credentials)
+        sp.set(discovery="cached", bytes=len(doc))
+        return build_from_document(doc, credentials=credentials)
+
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def _upload_key(file_path, file_name):
+    st = os.stat(file_path)
+    return {"path": os.path.abspath(file_path), "name": file_name, "size": st.st_size, "mtime": st.st_mtime}
+
+
+def _load_upload_session(key):
+    """Session URI of an unfinished upload of this exact file, if any."""
+    try:
+        with open(UPLOAD_SESSION_FILE) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved.get("uri") if saved.get("key") == key else None
+
+
+def _save_upload_session(key, uri):
+    _atomic_write(UPLOAD_SESSION_FILE, json.dumps({"key": key, "uri": uri}))
+
+
+def _clear_upload_session():
+    try:
+        os.remove(UPLOAD_SESSION_FILE)
+    except OSError:
+        pass
+
+
+def _backoff(attempt):
+    return min(2 ** attempt, 64) + random.random()
+
+
+def _media(file_path, chunk_size=None):
+    """PDF media body. Files that fit in one chunk go up in a single multipart
+    request; anything larger uses a resumable, chunked session."""
+    _import_google()
+    chunk_size = chunk_size or UPLOAD_CHUNK_SIZE
+    resumable = os.path.getsize(file_path) > chunk_size
+    return MediaFileUpload(file_path, mimetype="application/pdf", resumable=resumable, chunksize=chunk_size)
+
+
+def _run_upload(request, key):
+    """Executes a files().create/update request carrying media and returns the
+    response. Chunks that fail with 429/5xx or a dropped connection are retried
+    with exponential backoff. The session URI is saved after every chunk, so if
+    the process dies the next run picks the upload up where it stopped."""
+    with tracing.span("upload", "drive", bytes=key["size"]) as sp:
+        return _upload_chunks(request, key, sp)
+
+
+def _resume_upload(request, uri):
+    """Points request at a saved upload session, asking the server how many
+    bytes it already holds (an empty PUT with "Content-Range: bytes */size").
+    Returns the finished file if the upload had in fact completed, else None."""
+    size = request.resumable.size()
+    resp, content = request.http.request(uri, "PUT", headers={"Content-Range": f"bytes */{size}",
+                                                              "Content-Length": "0"})
+    if resp.status in (200, 201):
+        return request.postproc(resp, content)
+    if resp.status != 308:
+        raise HttpError(resp, content, uri=uri)
+    request.resumable_uri = uri
+    # "Range: bytes=0-N" once the server has any bytes
+    request.resumable_progress = int(resp["range"].split("-")[1]) + 1 if "range" in resp else 0
+    return None
+
+
+def _upload_chunks(request, key, sp):
+    if request.resumable is None:
+        sp.set(kind="multipart")
+        return request.execute(num_retries=UPLOAD_MAX_RETRIES)
+
+    sp.set(kind="resumable")
+    file, resumed = None, _load_upload_session(key)
+    if resumed:
+        print("Resuming interrupted upload...")
+        try:
+            file = _resume_upload(request, resumed)
+        except HttpError as error:
+            print(f"Saved upload session is gone ({error.resp.status}); starting over.")
+        except TransportError as error:
+            print(f"Could not query the saved upload session ({error}); starting over.")
+
+    attempt = 0
+    while file is None:
+        try:
+            # after a failed chunk (error status or dropped connection) the
+            # next call first asks the server how many bytes arrived. Retries
+            # are ours: next_chunk(num_retries=...) re-sends the chunk from a
+            # stream slice its first attempt already consumed.
+            status, file = request.next_chunk()
+        except HttpError as error:
+            code = error.resp.status
+            if request.resumable_uri and code in (404, 410):
+                print("Upload session expired; starting over.")
+                _clear_upload_session()
+                request.resumable_uri, request.resumable_progress = None, 0
+                continue
+            if code not in RETRYABLE_STATUS or attempt >= UPLOAD_MAX_RETRIES:
+                raise
+            attempt += 1
+            sp.add(retries=1)
+            delay = _backoff(attempt)
+            print(f"Upload chunk failed ({code}); retry {attempt}/{UPLOAD_MAX_RETRIES} in {delay:.1f}s...")
+            time.sleep(delay)
+            continue
+        except TransportError as error:
+            if attempt >= UPLOAD_MAX_RETRIES:
+                raise
+            attempt += 1
+            sp.add(retries=1)
+            delay = _backoff(attempt)
+            print(f"Upload connection error ({error}); retry {attempt}/{UPLOAD_MAX_RETRIES} in {delay:.1f}s...")
+            time.sleep(delay)
+            continue
+        attempt = 0
+        sp.add(chunks=1)
+        if request.resumable_uri:
+            _save_upload_session(key, request.resumable_uri)
+        if status:
+            print(f"  {int(status.progress() * 100)}% uploaded")
+    _clear_upload_session()
+    return file
+
+
+def upload_file_to_drive(service, file_path, file_name, chunk_size=None):
+    """Uploads a file to Google Drive as a new file and returns the file ID."""
     try:
         print(f"Uploading '{file_path}' to Google Drive as '{file_name}'...")
-        media = MediaFileUpload(file_path, mimetype="application/pdf")
+        key = _upload_key(file_path, file_name)
         file_metadata = {"name": file_name}
-        file = service.files().create(body=file_metadata, media_body=media, fields="id").execute()
-        file_id = file.get("id")
+        request = service.files().create(body=file_metadata, media_body=_media(file_path, chunk_size), fields="id")
+        file_id = _run_upload(request, key).get("id")
         print(f"File uploaded successfully. File ID: {file_id}")
         return file_id
     except HttpError as error:
@@ -58,6 +305,31 @@ def upload_file_to_drive(service, file_path, file_name):
     except FileNotFoundError:
         print(f"Error: The file was not found at '{file_path}'. Please check the path.")
         return None
+    except TransportError as error:
+        print(f"Upload failed after {UPLOAD_MAX_RETRIES} retries: {error}")
+        return None
+
+
+def update_file_in_place(service, file_id, file_path, chunk_size=None):
+    """Pushes file_path as a new revision of an existing Drive file, keeping its
+    ID (and thus every link to it). Returns the file ID, or None if the file
+    cannot be updated (e.g. it was deleted or is not owned by this app)."""
+    try:
+        print(f"Uploading '{file_path}' as a new revision of Drive file {file_id}...")
+        key = dict(_upload_key(file_path, None), file_id=file_id)
+        request = service.files().update(fileId=file_id, media_body=_media(file_path, chunk_size), fields="id")
+        _run_upload(request, key)
+        print("File updated in place.")
+        return file_id
+    except HttpError as error:
+        print(f"Could not update file {file_id} in place: {error}")
+        return None
+    except FileNotFoundError:
+        print(f"Error: The file was not found at '{file_path}'. Please check the path.")
+        return None
+    except TransportError as error:
+        print(f"Upload failed after {UPLOAD_MAX_RETRIES} retries: {error}")
+        return None
 
 
 def share_file_publicly(service, file_id):
@@ -65,10 +337,13 @@ def share_file_publicly(service, file_id):
     try:
         print("Making file public...")
         permission = {"type": "anyone", "role": "reader"}
-        service.permissions().create(fileId=file_id, body=permission).execute()
+        with tracing.span("permissions.create", "drive"):
+            service.permissions().create(fileId=file_id, body=permission).execute()
         print("File is now publicly viewable by anyone with the link.")
+        return True
     except HttpError as error:
         print(f"An error occurred while setting permissions: {error}")
+        return False
 
 
 # --- NEW: find + delete previous resume files ---
@@ -78,41 +353,115 @@ def _find_files_by_name(service, name):
     page_token = None
     query = f"name = '{name}' and trashed = false"
     fields = "nextPageToken, files(id, name, createdTime)"
-    try:
-        while True:
-            resp = service.files().list(q=query, fields=fields, pageToken=page_token).execute()
-            results.extend(resp.get("files", []))
-            page_token = resp.get("nextPageToken")
-            if not page_token:
-                break
-    except HttpError as error:
-        print(f"Error searching files: {error}")
+    with tracing.span("files.list", "drive") as sp:
+        try:
+            while True:
+                # 1000 is the largest page Drive allows; one page covers years of publishes
+                resp = service.files().list(q=query, fields=fields, pageSize=1000, pageToken=page_token).execute()
+                results.extend(resp.get("files", []))
+                sp.add(pages=1)
+                page_token = resp.get("nextPageToken")
+                if not page_token:
+                    break
+        except HttpError as error:
+            print(f"Error searching files: {error}")
+        sp.set(rows=len(results))
     return results
 
 
-def _trash_or_delete_file(service, file_id, permanent=False):
-    """Trash (default) or permanently delete a Drive file."""
-    try:
-        if permanent:
-            service.files().delete(fileId=file_id).execute()
-        else:
-            service.files().update(fileId=file_id, body={"trashed": True}).execute()
-    except HttpError as error:
-        print(f"Error deleting file {file_id}: {error}")
+def _trash_or_delete_request(service, file_id, permanent=False):
+    """Unexecuted request that trashes (default) or permanently deletes a Drive file."""
+    if permanent:
+        return service.files().delete(fileId=file_id)
+    return service.files().update(fileId=file_id, body={"trashed": True})
 
 
-def delete_previous_resume_files(service, file_name, keep_file_id, permanent=False):
-    """Delete/trash all files named file_name except keep_file_id. Returns count removed."""
+def run_batch(service, calls):
+    """Sends {request_id: factory} as multipart batch requests of up to
+    BATCH_SIZE calls each; a factory returns a fresh unexecuted request so it
+    can be re-sent. Items failing with 429/5xx are retried in a later batch
+    with backoff. Returns (succeeded ids, {id: error}, round trips)."""
+    pending, failed, ok = dict(calls), {}, []
+    trips = attempt = 0
+    while pending:
+        retry = {}
+        items = list(pending.items())
+        for i in range(0, len(items), BATCH_SIZE):
+            results = {}
+            batch = service.new_batch_http_request(
+                callback=lambda request_id, response, exception: results.__setitem__(request_id, exception))
+            for request_id, factory in items[i:i + BATCH_SIZE]:
+                batch.add(factory(), request_id=request_id)
+            with tracing.span("batch", "drive", rows=len(items[i:i + BATCH_SIZE])) as sp:
+                try:
+                    batch.execute()
+                except HttpError as error:  # the whole batch was rejected
+                    results = {request_id: error for request_id, _ in items[i:i + BATCH_SIZE]}
+                sp.set(failed=sum(e is not None for e in results.values()))
+            trips += 1
+            for request_id, error in results.items():
+                if error is None:
+                    ok.append(request_id)
+                elif (isinstance(error, HttpError) and error.resp.status in RETRYABLE_STATUS
+                        and attempt < BATCH_MAX_RETRIES):
+                    retry[request_id] = pending[request_id]
+                else:
+                    failed[request_id] = error
+        if retry:
+            attempt += 1
+            delay = _backoff(attempt)
+            print(f"{len(retry)} batched call(s) failed transiently; retrying in {delay:.1f}s...")
+            time.sleep(delay)
+        pending = retry
+    return ok, failed, trips
+
+
+def _report_batch(calls, trips):
+    saved = len(calls) - trips
+    if saved > 0:
+        print(f"{len(calls)} Drive call(s) sent in {trips} batch request(s); {saved} round trip(s) saved.")
+
+
+def _cleanup_batch(service, file_name, keep_file_id, permanent=False, share_file_id=None):
+    """Delete/trash all files named file_name except keep_file_id, in batched
+    requests. With share_file_id, the public-read permission for that file is
+    created in the same batch. Returns (count removed, shared)."""
     candidates = _find_files_by_name(service, file_name)
-    removed = 0
+    calls = {}
     for f in candidates:
         if f["id"] == keep_file_id:
             continue
-        _trash_or_delete_file(service, f["id"], permanent=permanent)
-        removed += 1
+        calls[f"trash:{f['id']}"] = (
+            lambda fid=f["id"]: _trash_or_delete_request(service, fid, permanent))
+    if share_file_id:
+        print("Making file public...")
+        calls[f"share:{share_file_id}"] = lambda: service.permissions().create(
+            fileId=share_file_id, body={"type": "anyone", "role": "reader"})
+
+    ok, failed, trips = run_batch(service, calls) if calls else ([], {}, 0)
+    for request_id, error in failed.items():
+        kind, file_id = request_id.split(":", 1)
+        what = "setting permissions on" if kind == "share" else "deleting file"
+        print(f"Error {what} {file_id}: {error}")
+    removed = sum(1 for request_id in ok if request_id.startswith("trash:"))
     action = "permanently deleted" if permanent else "moved to Trash"
     print(f"{removed} old file(s) {action}.")
-    return removed
+    _report_batch(calls, trips)
+    shared = f"share:{share_file_id}" in ok
+    if shared:
+        print("File is now publicly viewable by anyone with the link.")
+    return removed, shared
+
+
+def delete_previous_resume_files(service, file_name, keep_file_id, permanent=False):
+    """Delete/trash all files named file_name except keep_file_id. Returns count removed."""
+    return _cleanup_batch(service, file_name, keep_file_id, permanent)[0]
+
+
+def replace_previous_and_share(service, file_name, new_file_id, permanent=False):
+    """Removes older copies of file_name and makes new_file_id public, all in
+    one batch. Returns (count removed, shared)."""
+    return _cleanup_batch(service, file_name, new_file_id, permanent, share_file_id=new_file_id)
 # --- END NEW ---
 
 
@@ -123,44 +472,105 @@ def update_sheet(service, spreadsheet_id, sheet_name, new_file_id):
         values = [[new_file_id]]
         body = {"values": values}
         print(f"Updating Google Sheet '{sheet_name}' at cell A2...")
-        result = service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id, range=range_to_update, valueInputOption="RAW", body=body
-        ).execute()
+        with tracing.span("values.update", "sheets"):
+            result = service.spreadsheets().values().update(
+                spreadsheetId=spreadsheet_id, range=range_to_update, valueInputOption="RAW", body=body
+            ).execute()
         print(f"{result.get('updatedCells')} cell(s) updated successfully.")
+        return True
     except HttpError as error:
         print(f"An error occurred while updating the sheet: {error}")
+        return False
+
+
+def read_sheet_file_id(service, spreadsheet_id, sheet_name):
+    """Returns the file ID currently in cell A2, or None."""
+    try:
+        with tracing.span("values.get", "sheets"):
+            result = service.spreadsheets().values().get(
+                spreadsheetId=spreadsheet_id, range=f"{sheet_name}!A2"
+            ).execute()
+    except HttpError as error:
+        print(f"An error occurred while reading the sheet: {error}")
+        return None
+    values = result.get("values") or [[]]
+    return (values[0] or [None])[0]
 
 
-def main():
-    creds = get_credentials()
+def _load_sync_state():
+    try:
+        with open(SYNC_STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_sync_state(state):
+    _atomic_write(SYNC_STATE_FILE, json.dumps(state, indent=2))
+
+
+def main(trace=None):
+    """Publishes LOCAL_FILE_PATH; returns the Drive file ID, or None on failure.
+    `trace` (a path, or True for the default) records timing spans; so does
+    setting RESUME_TRACE."""
+    owns_trace = tracing.start(trace)
+    try:
+        return _publish()
+    finally:
+        if owns_trace:
+            tracing.finish()
+
+
+def _publish():
+    with tracing.span("credentials", "setup"):
+        creds = get_credentials()
     if not creds:
         print("Could not authenticate. Exiting.")
-        return
+        return None
 
     try:
-        drive_service = build("drive", "v3", credentials=creds)
-        sheets_service = build("sheets", "v4", credentials=creds)
+        drive_service = build_service("drive", "v3", creds)
+        sheets_service = build_service("sheets", "v4", creds)
     except HttpError as error:
         print(f"An error occurred while building the services: {error}")
-        return
+        return None
+
+    state = _load_sync_state()
+    if UPDATE_IN_PLACE:
+        target = state.get("file_id")
+        if not target:
+            target = read_sheet_file_id(sheets_service, SPREADSHEET_ID, SHEET_NAME)
+            if target:
+                state = {"file_id": target, "sheet_value": target}
+        if target and update_file_in_place(drive_service, target, LOCAL_FILE_PATH):
+            if not state.get("shared"):
+                state["shared"] = share_file_publicly(drive_service, target)
+            if state.get("sheet_value") != target and update_sheet(sheets_service, SPREADSHEET_ID, SHEET_NAME, target):
+                state["sheet_value"] = target
+            _save_sync_state(state)
+            print("\nProcess complete! The CV was updated in place; its link is unchanged.")
+            return target
+        if target:
+            print("Falling back to uploading a new file.")
 
     new_file_id = upload_file_to_drive(drive_service, LOCAL_FILE_PATH, DRIVE_FILE_NAME)
 
     if new_file_id:
-        # Remove previous files with the same name (except the new one)
-        delete_previous_resume_files(
-            drive_service, DRIVE_FILE_NAME, keep_file_id=new_file_id, permanent=PERMANENT_DELETE
+        # Remove previous files with the same name (except the new one) and
+        # make the surviving (new) file public, batched together
+        _, shared = replace_previous_and_share(
+            drive_service, DRIVE_FILE_NAME, new_file_id, permanent=PERMANENT_DELETE
         )
 
-        # Make the surviving (new) file public
-        share_file_publicly(drive_service, new_file_id)
-
         # Update the Sheet with the fresh file ID
-        update_sheet(sheets_service, SPREADSHEET_ID, SHEET_NAME, new_file_id)
+        written = update_sheet(sheets_service, SPREADSHEET_ID, SHEET_NAME, new_file_id)
 
+        _save_sync_state({"file_id": new_file_id, "shared": shared,
+                          "sheet_value": new_file_id if written else None})
         print("\nProcess complete! Your website will now show the updated and publicly accessible CV.")
     else:
         print("\nProcess failed. The Google Sheet was not updated.")
+    return new_file_id
 
 
 if __name__ == "__main__":
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# Fetch policy for the sheet downloads (build_and_compile.fetch_rows/iter_rows):
+#   - an overall deadline for the build (start(seconds)); nothing waits past it
+#   - per-attempt timeouts from the tab's recent latency (TIMEOUT_FACTOR x p99),
+#     never above the caller's flat timeout or the time left
+#   - a hedged duplicate request once an attempt has taken longer than the
+#     tab's HEDGE_PERCENTILE latency (and another after twice that); the first
+#     response wins
+#   - retries with full-jitter exponential backoff on 429/5xx and network
+#     errors, honouring Retry-After
+#   - a per-host circuit breaker: after BREAKER_FAILURES failures in a row the
+#     host is not contacted for BREAKER_COOLDOWN seconds, then one probe is let
+#     through
+# Errors are raised as requests exceptions, so callers' cached-copy fallbacks
+# keep working. Each tab's latency histogram and recent samples are kept in
+# LATENCY_FILE; the samples seed the timeouts and hedge delays of the next run.
+#   python3 fetch_policy.py        # print the histograms
+import json, math, os, random, threading, time
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+import tracing
+
+# === Config ===
+RETRY_ATTEMPTS      = 4        # attempts per fetch, hedges not counted
+BACKOFF_BASE        = 0.5      # seconds; sleep is uniform(0, min(BACKOFF_MAX, BASE * 2**n))
+BACKOFF_MAX         = 8.0
+RETRY_STATUSES      = {429, 500, 502, 503, 504}
+TIMEOUT_FACTOR      = 3.0      # attempt timeout = factor x p99 of recent latency ...
+MIN_TIMEOUT         = 2.0      # ... but at least this many seconds
+HEDGE_PERCENTILE    = 95       # send a duplicate once an attempt is slower than this
+HEDGE_MIN_DELAY     = 0.05     # seconds
+MAX_HEDGES          = 2        # duplicates per attempt, each after another such delay
+MIN_SAMPLES         = 20       # samples needed before a percentile means anything; until a tab
+                               # has them, its host's samples are used
+HISTORY             = 200      # recent samples kept per tab
+BREAKER_FAILURES    = 5
+BREAKER_COOLDOWN    = 30.0     # seconds
+LATENCY_FILE        = Path(".cache/fetch_latency.json")
+LATENCY_BUCKETS     = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)   # seconds; plus "inf"
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The build's fetch deadline passed."""
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host failed too often recently; not contacted."""
+
+
+_LOCK = threading.Lock()
+_DEADLINE = None
+_STATS = None            # url -> {"label", "samples", "buckets"}
+_RUN = defaultdict(lambda: {"latencies": [], "retries": 0, "hedges": 0, "hedge_wins": 0, "errors": 0})
+_BREAKERS = {}           # host -> {"failures", "opened", "probing"}
+
+
+# --- deadline ---
+def start(seconds=None):
+    """Begin a build: every fetch from now on must finish within `seconds`
+    (None: no deadline). Clears this run's counters."""
+    global _DEADLINE
+    _DEADLINE = time.monotonic() + seconds if seconds else None
+    _RUN.clear()
+
+def remaining():
+    """Seconds until the deadline, or None without one."""
+    return None if _DEADLINE is None else _DEADLINE - time.monotonic()
+
+
+# --- latency statistics ---
+def _stats():
+    global _STATS
+    if _STATS is None:
+        try:
+            _STATS = json.loads(LATENCY_FILE.read_text(encoding="utf-8"))["tabs"]
+        except (OSError, ValueError, KeyError):
+            _STATS = {}
+    return _STATS
+
+def _entry(url, label):
+    entry = _stats().setdefault(url, {"label": label, "samples": [], "buckets": [0] * (len(LATENCY_BUCKETS) + 1)})
+    entry["label"] = label
+    return entry
+
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+def _samples(url):
+    """Recent latencies of this tab, or of every tab on its host when it has
+    too few of its own."""
+    with _LOCK:
+        own = list(_stats().get(url, {}).get("samples", ()))
+        if len(own) >= MIN_SAMPLES:
+            return own
+        host = urlsplit(url).netloc
+        shared = [s for u, e in _stats().items() if urlsplit(u).netloc == host for s in e["samples"]]
+    return shared if len(shared) >= MIN_SAMPLES else None
+
+def attempt_timeout(url, ceiling):
+    samples = _samples(url)
+    timeout = ceiling if not samples else min(ceiling, max(MIN_TIMEOUT, TIMEOUT_FACTOR * percentile(samples, 99)))
+    left = remaining()
+    if left is not None:
+        if left <= 0:
+            raise DeadlineExceeded(f"fetch deadline passed before {url}")
+        timeout = min(timeout, left)
+    return timeout
+
+def hedge_delay(url):
+    samples = _samples(url)
+    return None if not samples else max(HEDGE_MIN_DELAY, percentile(samples, HEDGE_PERCENTILE))
+
+def _observe_attempt(url, label, seconds):
+    with _LOCK:
+        samples = _entry(url, label)["samples"]
+        samples.append(round(seconds, 4))
+        del samples[:-HISTORY]
+
+def _observe_fetch(url, label, seconds):
+    with _LOCK:
+        _entry(url, label)["buckets"][bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        _RUN[label]["latencies"].append(seconds)
+
+
+# --- circuit breaker ---
+def _breaker(host):
+    return _BREAKERS.setdefault(host, {"failures": 0, "opened": None, "probing": False})
+
+def _allow(host):
+    with _LOCK:
+        b = _breaker(host)
+        if b["opened"] is None:
+            return True
+        if time.monotonic() - b["opened"] < BREAKER_COOLDOWN or b["probing"]:
+            return False
+        b["probing"] = True  # half-open: this request decides
+        return True
+
+def _record(host, ok):
+    with _LOCK:
+        b = _breaker(host)
+        b["probing"] = False
+        if ok:
+            b["failures"], b["opened"] = 0, None
+        else:
+            b["failures"] += 1
+            if b["failures"] >= BREAKER_FAILURES or b["opened"] is not None:
+                if b["opened"] is None:
+                    print(f"WARNING: {host} failed {b['failures']} times in a row; "
+                          f"not contacting it for {BREAKER_COOLDOWN:g}s.")
+                b["opened"] = time.monotonic()
+
+
+# --- requests ---
+def _submit(fn, *args):
+    """fn(*args) on a thread of its own; returns its Future. The thread is a
+    daemon: an attempt that lost the race must not keep the process alive
+    until its timeout (a pool's workers are joined at exit)."""
+    future = Future()
+    def run():
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args))
+            except BaseException as error:
+                future.set_exception(error)
+    threading.Thread(target=run, name="fetch", daemon=True).start()
+    return future
+
+def _attempt(session, url, headers, timeout, stream):
+    r = session.get(url, headers=headers, timeout=timeout, stream=stream)
+    return r, time.perf_counter()  # when it answered
+
+def _discard(future):
+    """Close the response of an attempt that lost the race, once it ends."""
+    def close(f):
+        if not f.cancelled() and f.exception() is None:
+            f.result()[0].close()
+    future.add_done_callback(close)
+
+def _race(session, url, headers, timeout, stream):
+    """One attempt, plus a hedge each time it goes another HEDGE_PERCENTILE
+    latency of the tab without an answer (at most MAX_HEDGES). The first
+    response wins; the others are closed when they arrive. Returns (response,
+    seconds since the first attempt was sent, hedges sent, a hedge won) or
+    raises the last error if no attempt got a response."""
+    start = time.perf_counter()
+    first = _submit(_attempt, session, url, headers, timeout, stream)
+    futures = [first]
+    delay = hedge_delay(url)
+    while delay is not None and len(futures) <= MAX_HEDGES and delay * len(futures) < timeout:
+        done, _ = wait(futures, timeout=delay, return_when=FIRST_COMPLETED)
+        left = remaining()
+        if done or (left is not None and left <= 0):
+            break
+        futures.append(_submit(_attempt, session, url, headers, timeout, stream))
+    left = remaining()
+    end = time.monotonic() + (timeout + 1 if left is None else max(0.0, min(timeout + 1, left)))
+    pending, winner, error = set(futures), None, None
+    while pending and winner is None:
+        done, pending = wait(pending, timeout=max(0.0, end - time.monotonic()), return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for f in done:
+            try:
+                f.result()
+            except requests.RequestException as e:
+                error = e
+                continue
+            winner = f  # even a 503: the retry loop backs off rather than wait on an outlier
+            break
+    for f in futures:
+        if f is not winner:
+            _discard(f)
+    if winner is not None:
+        r, answered = winner.result()
+        return r, answered - start, len(futures) - 1, winner is not first
+    if error is not None:
+        raise error
+    if remaining() is not None and remaining() <= 0:
+        raise DeadlineExceeded(f"fetch deadline passed while fetching {url}")
+    raise requests.Timeout(f"no answer from {url} within {timeout:.1f}s")
+
+def _backoff(attempt, retry_after=None):
+    """Full jitter: uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**(attempt-1))),
+    but at least what Retry-After asks for (capped at BACKOFF_MAX)."""
+    sleep = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+    try:
+        return max(sleep, min(float(retry_after), BACKOFF_MAX))
+    except (TypeError, ValueError):
+        return sleep
+
+def get(session, url, headers=None, timeout=30, stream=False, label=None):
+    """session.get(url) under the policy. Returns the response; raises
+    HTTPError if every attempt got a retryable status, and DeadlineExceeded,
+    CircuitOpenError or the last requests error if none got a response.
+    `timeout` is the ceiling for one attempt."""
+    label = label or url
+    host = urlsplit(url).netloc
+    with _LOCK:
+        run = _RUN[label]
+    t0 = time.perf_counter()
+    last = retry_after = None
+    try:
+        for attempt in range(RETRY_ATTEMPTS):
+            if attempt:
+                sleep = _backoff(attempt, retry_after)
+                left = remaining()
+                if left is not None and sleep >= left:
+                    break
+                run["retries"] += 1
+                time.sleep(sleep)
+            if not _allow(host):
+                raise CircuitOpenError(f"{host} is failing; not fetching {url}")
+            per_attempt = attempt_timeout(url, timeout)
+            with tracing.span(f"attempt {label}", "fetch", url=url, attempt=attempt + 1,
+                              timeout=round(per_attempt, 3)) as sp:
+                try:
+                    r, seconds, hedges, hedge_won = _race(session, url, headers, per_attempt, stream)
+                except requests.RequestException as error:
+                    _record(host, False)
+                    run["errors"] += 1
+                    last = error
+                    if isinstance(error, DeadlineExceeded):
+                        raise
+                    continue
+                sp.set(status=r.status_code, hedges=hedges, hedge_won=hedge_won)
+            run["hedges"] += hedges
+            run["hedge_wins"] += hedge_won
+            if r.status_code not in RETRY_STATUSES:
+                _record(host, True)
+                _observe_attempt(url, label, seconds)
+                return r
+            _record(host, False)
+            run["errors"] += 1
+            last, retry_after = r, r.headers.get("Retry-After")
+            r.close()
+        if isinstance(last, Exception):
+            raise last
+        last.raise_for_status()  # closed above; status and reason are all it needs
+    finally:
+        _observe_fetch(url, label, time.perf_counter() - t0)
+
+
+# --- reporting ---
+def save():
+    """Write every tab's histogram and recent samples to LATENCY_FILE."""
+    if _STATS is None:
+        return
+    with _LOCK:
+        data = json.dumps({"buckets": [*LATENCY_BUCKETS, "inf"], "tabs": _STATS}, indent=1, sort_keys=True)
+    LATENCY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = LATENCY_FILE.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(data, encoding="utf-8")
+    os.replace(tmp, LATENCY_FILE)
+
+def run_stats():
+    """{label: {"latencies", "retries", "hedges", "hedge_wins", "errors"}} since start()."""
+    with _LOCK:
+        return {label: dict(r, latencies=list(r["latencies"])) for label, r in _RUN.items()}
+
+def summary():
+    """One line about this run's fetches, or "" if there were none."""
+    runs = run_stats().values()
+    latencies = [s for r in runs for s in r["latencies"]]
+    if not latencies:
+        return ""
+    total = lambda key: sum(r[key] for r in runs)
+    return (f"Fetched {len(latencies)} tab(s): p50 {percentile(latencies, 50):.2f}s, "
+            f"max {max(latencies):.2f}s; {total('retries')} retries, {total('hedges')} hedged requests "
+            f"({total('hedge_wins')} answered first).")
+
+def histogram_lines():
+    """A table of every tab's fetch-time histogram, over all recorded runs."""
+    lines = [f"{'tab':24s} " + " ".join(f"{'<=' + format(b, 'g'):>6s}" for b in LATENCY_BUCKETS) + f" {'>':>6s}"]
+    for url, entry in sorted(_stats().items(), key=lambda kv: kv[1]["label"]):
+        lines.append(f"{entry['label'][:24]:24s} " + " ".join(f"{n:6d}" for n in entry["buckets"]))
+    return lines
+
+if __name__ == "__main__":
+    for line in histogram_lines():
+        print(line)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# pip install Pillow   (AVIF needs Pillow >= 11.3 built with libavif, or pillow-avif-plugin)
+# Responsive image variants for the website:
+#   python3 optimize_images.py [--force] [--jobs N]
+# Every image under assets/img is resized to IMAGE_WIDTHS (never upscaled) and
+# encoded as AVIF and WebP by a process pool, into assets/img/optimized/ with
+# the source hash in each file name. manifest.json there records what was
+# built from which source, so unchanged images are skipped on the next run.
+# Animated GIFs are left alone: as animated WebP they came out larger than the
+# GIF, and a <video> of the clip (as for star_ppo_pid_mppi_L1.mp4) is far smaller.
+# index.html is then rewritten: static <img> tags of those images become
+# <picture> elements with srcset/sizes and lazy loading, and IMAGE_VARIANTS
+# (read by the profile image slider) is refreshed.
+import argparse, hashlib, html, json, os, re, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from build_and_compile import SITE_INDEX, SITE_ROOT, write_if_changed
+
+# === Paths ===
+IMG_DIR  = SITE_ROOT / "assets" / "img"
+OUT_DIR  = IMG_DIR / "optimized"
+MANIFEST = OUT_DIR / "manifest.json"
+
+# === Variants ===
+IMAGE_EXTS    = {".jpg", ".jpeg", ".png", ".gif"}
+IMAGE_WIDTHS  = (384, 768, 1280, 1920)       # px; plus the source width if it is smaller
+IMAGE_FORMATS = ("avif", "webp")              # <source> order: the browser takes the first it supports
+IMAGE_QUALITY = {"avif": 50, "webp": 75}
+IMAGE_SIZES   = "100vw"                       # sizes for <img> tags that do not set their own
+IMAGE_WORKERS = os.cpu_count() or 1
+
+
+def _sha256(path:Path)->str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _url(path:Path)->str:
+    return path.relative_to(SITE_ROOT).as_posix()
+
+def _supported_formats():
+    from PIL import Image
+    try:
+        import pillow_avif  # noqa: F401  (registers AVIF on older Pillow)
+    except ImportError:
+        pass
+    Image.init()  # load every format plugin so Image.SAVE is complete
+    return [f for f in IMAGE_FORMATS if f.upper() in Image.SAVE]
+
+def _widths(width:int):
+    top = min(width, max(IMAGE_WIDTHS))
+    return sorted({w for w in IMAGE_WIDTHS if w < top} | {top})
+
+def _encode(src, fmt, widths, quality, stem):
+    """Worker: write src at each width as fmt; [(path, width, bytes)]."""
+    from PIL import Image, ImageOps
+    out = []
+    with Image.open(src) as im:
+        alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        im = ImageOps.exif_transpose(im).convert("RGBA" if alpha else "RGB")
+        W, H = im.size
+        for w in widths:
+            size = (w, max(1, round(H * w / W)))
+            resized = im if im.size == size else im.resize(size, Image.LANCZOS)
+            path = Path(f"{stem}-{w}.{fmt}")
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            kwargs = {"quality": quality, "method": 6} if fmt == "webp" else {"quality": quality}
+            resized.save(tmp, format=fmt.upper(), **kwargs)
+            os.replace(tmp, path)
+            out.append((str(path), w, path.stat().st_size))
+    return out
+
+def _load_manifest():
+    try:
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _current(entry, digest, settings):
+    return (entry and entry.get("sha256") == digest and entry.get("settings") == settings
+            and all((SITE_ROOT / v[0]).exists() for vs in entry["variants"].values() for v in vs))
+
+def optimize(force=False, jobs=None):
+    """Build the variants of every changed image; returns the manifest."""
+    from PIL import Image
+    formats = _supported_formats()
+    if not formats:
+        raise SystemExit(f"Pillow cannot write any of {', '.join(IMAGE_FORMATS)} here.")
+    if len(formats) < len(IMAGE_FORMATS):
+        print(f"Pillow cannot write {', '.join(f for f in IMAGE_FORMATS if f not in formats)} here; skipping it.")
+    old = _load_manifest().get("images", {})
+    images, todo = {}, []
+    sources = sorted(p for p in IMG_DIR.rglob("*")
+                     if p.suffix.lower() in IMAGE_EXTS and OUT_DIR not in p.parents)
+    for src in sources:
+        url, digest = _url(src), _sha256(src)
+        with Image.open(src) as im:
+            width, height = im.size
+            if getattr(im, "is_animated", False):
+                print(f"Skipping {url}: animated.")
+                continue
+        settings = hashlib.sha256(json.dumps([_widths(width), formats, IMAGE_QUALITY]).encode()).hexdigest()[:12]
+        if not force and _current(old.get(url), digest, settings):
+            images[url] = old[url]
+            continue
+        # the source hash in the name: a changed image gets new URLs, so no stale caches
+        stem = OUT_DIR / src.relative_to(IMG_DIR).with_suffix("")
+        stem = stem.with_name(f"{stem.name}-{digest[:8]}")
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        images[url] = {"sha256": digest, "settings": settings, "bytes": src.stat().st_size,
+                       "width": width, "height": height, "variants": {}}
+        todo += [(url, fmt, (str(src), fmt, _widths(width), IMAGE_QUALITY[fmt], str(stem))) for fmt in formats]
+
+    if todo:
+        t = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs or IMAGE_WORKERS, len(todo)))) as pool:
+            futures = [(url, fmt, pool.submit(_encode, *job)) for url, fmt, job in todo]
+            for url, fmt, future in futures:
+                # a variant no smaller than the source is not worth a srcset entry (it is pruned below)
+                images[url]["variants"][fmt] = [[_url(Path(p)), w, n] for p, w, n in future.result()
+                                                if n < images[url]["bytes"]]
+        print(f"Encoded {len(todo)} image/format pair(s) in {time.perf_counter() - t:.1f}s "
+              f"with {min(jobs or IMAGE_WORKERS, len(todo))} process(es).")
+    else:
+        print("All images up to date.")
+
+    manifest = {"images": images}
+    write_if_changed(MANIFEST, json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+    keep = {MANIFEST} | {SITE_ROOT / v[0] for e in images.values() for vs in e["variants"].values() for v in vs}
+    for p in OUT_DIR.rglob("*"):
+        if p.is_file() and p not in keep:
+            p.unlink()
+    return manifest
+
+
+# --- index.html ---
+_PICTURE_RE  = re.compile(r"<picture data-optimized>(?:\s*<source[^>]*>)*\s*(<img\b[^>]*>)\s*</picture>")
+_IMG_RE      = re.compile(r"<img\b[^>]*>")
+_ATTR_RE     = r'\b{}\s*=\s*"([^"]*)"'
+_VARIANTS_RE = re.compile(r"^([ \t]*const IMAGE_VARIANTS = ).*?;(\r?)$", re.M)
+
+def srcsets(entry):
+    """{format: "url 384w, url 768w"} for one manifest entry, in IMAGE_FORMATS order."""
+    return {fmt: ", ".join(f"{u} {w}w" for u, w, _ in entry["variants"][fmt])
+            for fmt in IMAGE_FORMATS if entry["variants"].get(fmt)}
+
+def _attr(tag, name):
+    m = re.search(_ATTR_RE.format(name), tag)
+    return html.unescape(m.group(1)) if m else None
+
+def _picture(tag, entry):
+    src_sets = srcsets(entry)
+    if not src_sets:
+        return tag
+    sizes = _attr(tag, "sizes") or IMAGE_SIZES
+    extra = []
+    if _attr(tag, "loading") is None and _attr(tag, "fetchpriority") is None:
+        extra.append('loading="lazy"')
+    if _attr(tag, "decoding") is None:
+        extra.append('decoding="async"')
+    if _attr(tag, "width") is None and _attr(tag, "height") is None:
+        extra.append(f'width="{entry["width"]}" height="{entry["height"]}"')  # reserves space: no layout shift
+    if extra:
+        tag = tag[:-1].rstrip("/ ") + " " + " ".join(extra) + ">"
+    sources = "".join(f'<source type="image/{fmt}" srcset="{html.escape(s)}" sizes="{html.escape(sizes)}">'
+                      for fmt, s in src_sets.items())
+    return f"<picture data-optimized>{sources}{tag}</picture>"
+
+def rewrite_html(text, images):
+    """index.html with its optimized <img> tags wrapped in <picture> and
+    IMAGE_VARIANTS listing the variants of every image the page mentions."""
+    text = _PICTURE_RE.sub(lambda m: m.group(1), text)  # previous run's wrappers
+    def img(m):
+        entry = images.get(_attr(m.group(0), "src") or "")
+        return _picture(m.group(0), entry) if entry else m.group(0)
+    text = _IMG_RE.sub(img, text)
+    used = {url: {"width": e["width"], "height": e["height"], "srcset": srcsets(e)}
+            for url, e in sorted(images.items())
+            if srcsets(e) and (f"'{url}'" in text or f'"{url}"' in text)}
+    data = json.dumps(used, separators=(",", ":"))
+    return _VARIANTS_RE.sub(lambda m: f"{m.group(1)}{data};{m.group(2)}", text, count=1)
+
+def report(images):
+    print(f"{'image':48s} {'source':>10s} {'served':>10s} {'saved':>7s}")
+    total_src = total_out = 0
+    for url, e in sorted(images.items()):
+        # what a large screen downloads: the widest variant of the preferred format
+        fmt = next((f for f in IMAGE_FORMATS if e["variants"].get(f)), None)
+        if fmt is None:  # no variant came out smaller than the source
+            continue
+        out = e["variants"][fmt][-1][2]
+        total_src += e["bytes"]
+        total_out += out
+        print(f"{url:48s} {e['bytes'] / 1024:8.1f}KB {out / 1024:8.1f}KB {1 - out / e['bytes']:6.0%}  ({fmt})")
+    if total_src:
+        print(f"{'total':48s} {total_src / 1024:8.1f}KB {total_out / 1024:8.1f}KB {1 - total_out / total_src:6.0%}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build responsive WebP/AVIF variants of the site's images.")
+    ap.add_argument("--force", action="store_true", help="re-encode every image, ignoring the manifest")
+    ap.add_argument("--jobs", type=int, default=None, help=f"encoder processes (default {IMAGE_WORKERS})")
+    args = ap.parse_args(argv)
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("Pillow is not installed (pip install Pillow); no images were optimized.")
+        return 1
+    manifest = optimize(force=args.force, jobs=args.jobs)
+    page = SITE_INDEX.read_bytes().decode("utf-8")  # bytes in and out: index.html keeps its CRLFs
+    if write_if_changed(SITE_INDEX, rewrite_html(page, manifest["images"])):
+        print(f"Updated image markup in {SITE_INDEX}.")
+    report(manifest["images"])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
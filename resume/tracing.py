@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Opt-in timing spans for the resume pipeline.
+#   python3 build_resume.py --trace               # writes .cache/trace.json
+#   RESUME_TRACE=out.json python3 cv_sync_google.py
+# Open the JSON in chrome://tracing or https://ui.perfetto.dev. When tracing is
+# off, span() returns a shared no-op object, so instrumented code pays one
+# function call and a global lookup per span.
+import json, os, threading, time
+from collections import defaultdict
+from pathlib import Path
+
+# === Config ===
+TRACE_ENV     = "RESUME_TRACE"            # set to a path (or "1") to trace any entry point
+DEFAULT_TRACE = Path(".cache/trace.json")
+
+_ENABLED = False
+_EVENTS = []
+_LOCK = threading.Lock()
+_T0 = time.perf_counter()
+_PATH = None
+
+
+class _NoSpan:
+    __slots__ = ()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+    def set(self, **args):
+        pass
+    def add(self, **counts):
+        pass
+
+_NOOP = _NoSpan()
+
+
+class Span:
+    """One timed region. `set` records attributes, `add` accumulates counts
+    (bytes, rows, ...). Both show up as the event's args in the trace."""
+    __slots__ = ("name", "cat", "args", "start", "tid")
+
+    def __init__(self, name, cat, args):
+        self.name, self.cat, self.args = name, cat, args
+
+    def __enter__(self):
+        self.tid = threading.get_ident()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        event = {"name": self.name, "cat": self.cat, "ph": "X", "pid": os.getpid(), "tid": self.tid,
+                 "ts": (self.start - _T0) * 1e6, "dur": (end - self.start) * 1e6, "args": self.args}
+        with _LOCK:
+            _EVENTS.append(event)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def add(self, **counts):
+        for k, v in counts.items():
+            self.args[k] = self.args.get(k, 0) + v
+
+
+def span(name, cat="stage", **args):
+    """Context manager timing a region, e.g.
+        with tracing.span("fetch", "fetch", url=url) as sp:
+            ...
+            sp.add(bytes=len(body), rows=len(rows))"""
+    if not _ENABLED:
+        return _NOOP
+    return Span(name, cat, args)
+
+def enabled():
+    return _ENABLED
+
+def enable(path=None):
+    """Start recording; `path` is where export() writes by default."""
+    global _ENABLED, _PATH
+    _ENABLED = True
+    _PATH = Path(path) if path else DEFAULT_TRACE
+
+def start(path=None):
+    """Turn tracing on for an entry point, from its --trace value (True for the
+    default path) or else from RESUME_TRACE ("1" means the default path).
+    Returns True only if this call enabled it, i.e. the caller should finish();
+    nested entry points (build_resume -> build_and_compile) leave it alone."""
+    if _ENABLED:
+        return False
+    path = path or os.environ.get(TRACE_ENV)
+    if not path:
+        return False
+    enable(None if path in (True, "1") else path)
+    return True
+
+def counted(items, sp, key="rows"):
+    """Pass items through, adding how many went by to sp[key]. Use it to count
+    rows or lines flowing through lazy builders without materializing them.
+    Returns items untouched when tracing is off."""
+    return items if sp is _NOOP else _counted(items, sp, key)
+
+def _counted(items, sp, key):
+    n = 0
+    try:
+        for item in items:
+            n += 1
+            yield item
+    finally:
+        sp.add(**{key: n})
+
+def export(path=None):
+    """Write the Chrome trace-event JSON; returns the path (None if disabled)."""
+    if not _ENABLED:
+        return None
+    path = Path(path) if path else _PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _LOCK:
+        events = sorted(_EVENTS, key=lambda e: e["ts"])
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+def _human_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def summary():
+    """One line: wall time per category (summed over spans, so parallel
+    fetches can add up to more than the elapsed time), with counts."""
+    with _LOCK:
+        events = list(_EVENTS)
+    totals = defaultdict(lambda: {"dur": 0.0, "n": 0, "bytes": 0, "rows": 0})
+    order = []
+    for e in sorted(events, key=lambda e: e["ts"]):
+        t = totals[e["cat"]]
+        if not t["n"]:
+            order.append(e["cat"])
+        t["n"] += 1
+        t["dur"] += e["dur"]
+        t["bytes"] += e["args"].get("bytes", 0)
+        t["rows"] += e["args"].get("rows", 0)
+    parts = []
+    for cat in order:
+        t = totals[cat]
+        extra = [f"x{t['n']}"] if t["n"] > 1 else []
+        if t["bytes"]:
+            extra.append(_human_bytes(t["bytes"]))
+        if t["rows"]:
+            extra.append(f"{t['rows']:,} rows")
+        parts.append(f"{cat} {t['dur'] / 1e6:.2f}s" + (f" ({', '.join(extra)})" if extra else ""))
+    return "trace: " + " | ".join(parts) if parts else "trace: no spans recorded"
+
+def finish():
+    """Export the trace and print the summary line (no-op when disabled)."""
+    path = export()
+    if path:
+        print(summary())
+        print(f"Trace written to {path}.")
+    return path